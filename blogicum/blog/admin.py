@@ -1,13 +1,64 @@
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
 
-from .models import Category, Location, Post
+from .deletion import tombstone_post, tombstone_user
+from .models import Category, Location, Post, Tombstone
+from .timeouts import query_budget
 
+User = get_user_model()
 
-class PostAdmin(admin.ModelAdmin):
+
+class TombstoneAdminMixin:
+    """Заменяет каскадное удаление из админки на отложенное.
+
+    Страница подтверждения не обходит связанные объекты, а сами объекты
+    скрываются сразу и удаляются командой ``purge_deleted``.
+    """
+
+    tombstone = None
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        perms_needed = set()
+        if not self.has_delete_permission(request):
+            perms_needed.add(self.opts.verbose_name)
+        return (
+            [str(obj) for obj in objs],
+            {self.opts.verbose_name_plural: len(objs)},
+            perms_needed,
+            [],
+        )
+
+    def delete_model(self, request, obj):
+        self.tombstone(obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            self.tombstone(obj)
+
+
+class PostAdmin(TombstoneAdminMixin, admin.ModelAdmin):
     empty_value_display = "Не задано"
+    tombstone = staticmethod(tombstone_post)
+
+    def changelist_view(self, request, extra_context=None):
+        view = query_budget()(super().changelist_view)
+        return view(request, extra_context)
+
+
+class BlogUserAdmin(TombstoneAdminMixin, UserAdmin):
+    tombstone = staticmethod(tombstone_user)
+
+
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "created_at")
 
 
 admin.site.empty_value_display = "Не задано"
 admin.site.register(Category)
 admin.site.register(Location)
 admin.site.register(Post, PostAdmin)
+admin.site.register(Tombstone, TombstoneAdmin)
+admin.site.unregister(User)
+admin.site.register(User, BlogUserAdmin)
@@ -0,0 +1,56 @@
+import threading
+from bisect import bisect_left
+
+from .snapshots import locations
+
+
+class PrefixIndex:
+    """Поиск опубликованных записей справочника по началу названия.
+
+    Названия в нижнем регистре лежат в отсортированном списке, и поиск
+    — это двоичный поиск первого подходящего названия. Список строится
+    из снимка справочника и перестраивается, когда снимок обновился.
+    """
+
+    def __init__(self, snapshot, label="name"):
+        self.snapshot = snapshot
+        self.label = label
+        self.version = None
+        self.index = ([], [])
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        snapshot = self.snapshot.refresh()
+        if snapshot.version == self.version:
+            return self
+        with self.lock:
+            if snapshot.version != self.version:
+                rows = sorted(
+                    (label.casefold(), record.id, label)
+                    for record in snapshot.records.values()
+                    if record.is_published
+                    for label in [getattr(record, self.label)]
+                )
+                self.index = (
+                    [key for key, _, _ in rows],
+                    [(pk, label) for _, pk, label in rows],
+                )
+                self.version = snapshot.version
+        return self
+
+    def search(self, prefix, limit=10):
+        """Список пар ``(id, название)``, начинающихся с ``prefix``."""
+        prefix = prefix.strip().casefold()
+        if not prefix:
+            return []
+        keys, entries = self.refresh().index
+        start = bisect_left(keys, prefix)
+        results = []
+        for position in range(start, len(keys)):
+            if len(results) >= limit or not keys[position].startswith(prefix):
+                break
+            results.append(entries[position])
+        return results
+
+
+location_index = PrefixIndex(locations)
@@ -0,0 +1,161 @@
+import time
+
+from django.apps import apps as global_apps
+from django.db import migrations, transaction
+from django.utils.timezone import now
+
+from .markup import render_markdown
+from .summary import summarize
+
+BACKFILLS = {}
+
+
+class Backfill:
+    """Пакетное преобразование строк модели с контрольной точкой.
+
+    ``transform`` получает объект модели, меняет поля из ``fields`` и
+    возвращает ``True``, если объект нужно сохранить. Поля из ``reads``
+    загружаются только для чтения. Строки читаются
+    пачками по первичному ключу, после каждой пачки в таблицу
+    ``BackfillCheckpoint`` записывается последний обработанный ключ, так
+    что прерванный прогон продолжается с того же места.
+    """
+
+    def __init__(
+        self,
+        name,
+        model,
+        fields,
+        transform,
+        batch_size=500,
+        pause=0.0,
+        reads=(),
+    ):
+        self.name = name
+        self.model = model
+        self.fields = list(fields)
+        self.reads = list(reads)
+        self.transform = transform
+        self.batch_size = batch_size
+        self.pause = pause
+
+    def get_checkpoint(self, apps):
+        Checkpoint = apps.get_model("blog", "BackfillCheckpoint")
+        checkpoint, _ = Checkpoint.objects.get_or_create(name=self.name)
+        return checkpoint
+
+    def reset(self, apps=global_apps):
+        self.get_checkpoint(apps).delete()
+
+    def run(self, apps=global_apps, batch_size=None, pause=None):
+        """Выполняет преобразование и отдаёт ``(обработано, изменено)``."""
+        batch_size = batch_size or self.batch_size
+        pause = self.pause if pause is None else pause
+        model = apps.get_model(self.model)
+        checkpoint = self.get_checkpoint(apps)
+        if checkpoint.finished_at is not None:
+            return
+        queryset = model._base_manager.order_by("pk").only(
+            "pk", *self.reads, *self.fields
+        )
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=checkpoint.last_pk)[:batch_size]
+            )
+            if not batch:
+                break
+            changed = [obj for obj in batch if self.transform(obj)]
+            with transaction.atomic():
+                if changed:
+                    model._base_manager.bulk_update(changed, self.fields)
+                checkpoint.last_pk = batch[-1].pk
+                checkpoint.rows_done += len(batch)
+                checkpoint.save(update_fields=["last_pk", "rows_done"])
+            yield len(batch), len(changed)
+            if pause:
+                time.sleep(pause)
+        checkpoint.finished_at = now()
+        checkpoint.save(update_fields=["finished_at"])
+
+
+def register(backfill):
+    BACKFILLS[backfill.name] = backfill
+    return backfill
+
+
+class RunBackfill(migrations.RunPython):
+    """Операция миграции, выполняющая зарегистрированный ``Backfill``.
+
+    Чтобы пачки фиксировались по отдельности, миграция должна быть
+    объявлена с ``atomic = False``.
+    """
+
+    def __init__(self, name, **kwargs):
+        self.backfill_name = name
+        kwargs.setdefault("reverse_code", migrations.RunPython.noop)
+        kwargs.setdefault("atomic", False)
+        super().__init__(self.forwards, **kwargs)
+
+    def forwards(self, apps, schema_editor):
+        for _ in BACKFILLS[self.backfill_name].run(apps):
+            pass
+
+    def deconstruct(self):
+        return self.__class__.__name__, [self.backfill_name], {}
+
+    def describe(self):
+        return f"Backfill {self.backfill_name}"
+
+
+def recompress_post_text(post):
+    field = type(post)._meta.get_field("text")
+    return len(post.text.encode("utf-8")) >= field.min_length
+
+
+register(
+    Backfill("compress_post_text", "blog.Post", ["text"], recompress_post_text)
+)
+
+
+def fill_post_summary(post):
+    excerpt, word_count = post.excerpt, post.word_count
+    summarize(post)
+    return (post.excerpt, post.word_count) != (excerpt, word_count)
+
+
+register(
+    Backfill(
+        "post_summary",
+        "blog.Post",
+        ["excerpt", "word_count"],
+        fill_post_summary,
+        reads=["text"],
+    )
+)
+
+
+def render_text_html(obj):
+    html = render_markdown(obj.text)
+    changed = html != obj.text_html
+    obj.text_html = html
+    return changed
+
+
+register(
+    Backfill(
+        "post_html",
+        "blog.Post",
+        ["text_html"],
+        render_text_html,
+        reads=["text"],
+    )
+)
+register(
+    Backfill(
+        "comment_html",
+        "blog.Comment",
+        ["text_html"],
+        render_text_html,
+        reads=["text"],
+    )
+)
@@ -0,0 +1,50 @@
+import random
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.test import Client
+
+WORDS = (
+    "блог публикация автор комментарий категория место текст заметка "
+    "день утро вечер город дорога море гора лес река небо солнце ветер "
+    "история путешествие встреча письмо книга музыка работа отдых"
+).split()
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """Выполняет замеры в транзакции, которая в конце откатывается."""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def make_text(words, seed=None):
+    rnd = random.Random(seed)
+    return " ".join(rnd.choice(WORDS) for _ in range(words))
+
+
+def bench_client(**defaults):
+    # Адрес вне INTERNAL_IPS, чтобы debug_toolbar не встраивался в ответы.
+    defaults.setdefault("REMOTE_ADDR", "10.0.0.1")
+    defaults.setdefault("HTTP_HOST", "localhost")
+    return Client(**defaults)
+
+
+def measure(func, repeat=20):
+    """Возвращает медиану и среднее время вызова ``func`` в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), statistics.mean(timings)
@@ -0,0 +1,120 @@
+import os
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+
+from .metrics import metrics
+from .models import InvalidationEvent
+
+# Доля публикаций, после которых удаляются старые события.
+PRUNE_PROBABILITY = 0.01
+BATCH_SIZE = 1000
+
+
+def origin():
+    # Вычисляется при каждом вызове: после fork у воркера свой pid.
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class InvalidationBus:
+    """Шина событий сброса кэшей между процессами через таблицу в базе.
+
+    Издатель сразу применяет событие в своём процессе, а после фиксации
+    транзакции записывает его в ``InvalidationEvent``. Остальные процессы
+    опрашивают таблицу не чаще раза в ``poll_interval`` секунд перед
+    обработкой запроса, поэтому задержка распространения ограничена
+    этим интервалом. Номер события служит версией: каждый процесс помнит
+    последний применённый номер.
+    """
+
+    def __init__(self, poll_interval=None, retention=None):
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.handlers = defaultdict(list)
+        self.clear_handlers = []
+        self.last_id = None
+        self.next_poll = 0.0
+        self.lock = threading.Lock()
+
+    def subscribe(self, topic, handler):
+        self.handlers[topic].append(handler)
+
+    def on_gap(self, handler):
+        """Регистрирует сброс всего кэша, если часть событий пропущена."""
+        self.clear_handlers.append(handler)
+
+    def dispatch(self, topic, key):
+        for handler in self.handlers[topic]:
+            handler(key)
+
+    def publish(self, topic, key=""):
+        key = str(key)
+        self.dispatch(topic, key)
+        transaction.on_commit(lambda: self.write(topic, key))
+
+    def write(self, topic, key):
+        InvalidationEvent.objects.create(
+            topic=topic, key=key, origin=origin(), created_at=time.time()
+        )
+        if random.random() < PRUNE_PROBABILITY:
+            self.prune()
+
+    def prune(self):
+        retention = self.retention or settings.INVALIDATION_BUS_RETENTION
+        InvalidationEvent.objects.filter(
+            created_at__lt=time.time() - retention
+        ).delete()
+
+    def poll(self, force=False):
+        interval = self.poll_interval or settings.INVALIDATION_BUS_POLL
+        now = time.monotonic()
+        if not force and now < self.next_poll:
+            return
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            self.next_poll = now + interval
+            self.consume()
+        finally:
+            self.lock.release()
+
+    def consume(self):
+        if self.last_id is None:
+            # Кэши нового процесса пусты, прошлые события ему не нужны.
+            self.last_id = (
+                InvalidationEvent.objects.aggregate(last=Max("id"))["last"]
+                or 0
+            )
+            return
+        events = list(
+            InvalidationEvent.objects.filter(id__gt=self.last_id).order_by(
+                "id"
+            )[:BATCH_SIZE]
+        )
+        if len(events) == BATCH_SIZE:
+            self.next_poll = 0.0
+        if events and events[0].id > self.last_id + 1:
+            oldest = InvalidationEvent.objects.aggregate(first=Min("id"))
+            if oldest["first"] > self.last_id + 1:
+                metrics.incr("bus.gaps")
+                for handler in self.clear_handlers:
+                    handler()
+        received = time.time()
+        own_origin = origin()
+        for event in events:
+            if event.origin != own_origin:
+                self.dispatch(event.topic, event.key)
+                metrics.incr("bus.events")
+                metrics.observe(
+                    "bus.propagation_delay", received - event.created_at
+                )
+            self.last_id = event.id
+
+
+bus = InvalidationBus()
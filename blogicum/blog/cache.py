@@ -0,0 +1,229 @@
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.db import transaction
+
+
+class LocalLRU:
+    """Ограниченный по числу записей кэш внутри процесса."""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            try:
+                self.data.move_to_end(key)
+            except KeyError:
+                return None
+            return self.data[key]
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+class TwoTierCache:
+    """Кэш из двух уровней: LRU процесса перед общим кэшем Django.
+
+    Записи хранятся как ``(значение, свежо_до, годно_до, время_расчёта)``.
+    До ``свежо_до`` значение отдаётся сразу, но с вероятностью, растущей
+    к концу срока, запрос пересчитывает его заранее (XFetch). После
+    ``свежо_до`` и до ``годно_до`` значение считается устаревшим: его
+    пересчитывает только один запрос, остальные получают старое
+    значение. Без записи или после ``годно_до`` значение пересчитывает
+    один запрос на ключ, остальные ждут его результата.
+
+    Ключи объединяются в пространства имён с номером версии в общем
+    кэше: ``invalidate(namespace)`` сбрасывает всё пространство. Процесс
+    запоминает версию на ``version_check`` секунд; о смене версии другим
+    процессом он узнаёт раньше из шины событий (``forget``).
+    """
+
+    def __init__(
+        self,
+        alias="blog",
+        max_entries=1000,
+        beta=1.0,
+        lock_timeout=10,
+        version_check=60.0,
+    ):
+        self.alias = alias
+        self.local = LocalLRU(max_entries)
+        self.beta = beta
+        self.lock_timeout = lock_timeout
+        self.version_check = version_check
+        self.versions = {}
+        self.version_lock = threading.Lock()
+        self.key_locks = {}
+        self.key_locks_guard = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def version(self, namespace):
+        cached = self.versions.get(namespace)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        version_key = f"version:{namespace}"
+        with self.version_lock:
+            version = self.shared.get(version_key)
+            if version is None:
+                # Версия по времени не совпадёт с версиями вытесненных
+                # записей.
+                version = int(time.time() * 1000)
+                if not self.shared.add(version_key, version, timeout=None):
+                    version = self.shared.get(version_key, version)
+            self.versions[namespace] = (
+                version,
+                time.monotonic() + self.version_check,
+            )
+        return version
+
+    def forget(self, namespace):
+        """Забывает версию пространства имён, запомненную процессом."""
+        self.versions.pop(namespace, None)
+
+    def invalidate(self, namespace):
+        version_key = f"version:{namespace}"
+        version = max(
+            self.shared.get(version_key, 0) + 1, int(time.time() * 1000)
+        )
+        self.shared.set(version_key, version, timeout=None)
+        self.versions.pop(namespace, None)
+
+    def invalidate_on_commit(self, namespace):
+        # Сбрасываем сразу и ещё раз после фиксации: иначе другой процесс
+        # успеет закэшировать данные, прочитанные до фиксации транзакции.
+        self.invalidate(namespace)
+        transaction.on_commit(lambda: self.invalidate(namespace))
+
+    def clear(self):
+        self.local.clear()
+        self.versions.clear()
+
+    def make_key(self, namespace, key):
+        return f"{namespace}:{self.version(namespace)}:{key}"
+
+    def lookup(self, full_key):
+        entry = self.local.get(full_key)
+        if entry is None:
+            entry = self.shared.get(full_key)
+            if entry is not None:
+                self.local.set(full_key, entry)
+        return entry
+
+    def store(self, full_key, value, ttl, stale_ttl, delta):
+        created = time.time()
+        entry = (value, created + ttl, created + ttl + stale_ttl, delta)
+        self.shared.set(full_key, entry, timeout=ttl + stale_ttl)
+        self.local.set(full_key, entry)
+
+    def get(self, namespace, key, default=None):
+        entry = self.lookup(self.make_key(namespace, key))
+        if entry is None or time.time() >= entry[1]:
+            return default
+        return entry[0]
+
+    def set(self, namespace, key, value, ttl):
+        self.store(self.make_key(namespace, key), value, ttl, 0, 0)
+
+    def delete(self, namespace, key, local_only=False):
+        full_key = self.make_key(namespace, key)
+        self.local.delete(full_key)
+        if not local_only:
+            self.shared.delete(full_key)
+
+    @contextmanager
+    def key_lock(self, full_key):
+        # Блокировка своя у каждого ключа: расчёт одного значения может
+        # запрашивать другие ключи того же кэша и не должен ждать сам себя.
+        with self.key_locks_guard:
+            entry = self.key_locks.setdefault(
+                full_key, [threading.Lock(), 0]
+            )
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self.key_locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self.key_locks[full_key]
+
+    def acquire(self, full_key):
+        return self.shared.add(
+            f"lock:{full_key}", 1, timeout=self.lock_timeout
+        )
+
+    def release(self, full_key):
+        self.shared.delete(f"lock:{full_key}")
+
+    def recompute(self, full_key, compute, ttl, stale_ttl):
+        started = time.time()
+        value = compute()
+        self.store(full_key, value, ttl, stale_ttl, time.time() - started)
+        return value
+
+    def get_or_compute(self, namespace, key, compute, ttl=60, stale_ttl=300):
+        full_key = self.make_key(namespace, key)
+        entry = self.lookup(full_key)
+        if entry is not None:
+            value, fresh_until, usable_until, delta = entry
+            now = time.time()
+            early = delta * self.beta * math.log(1 - random.random())
+            if now - early < fresh_until:
+                return value
+            if now < usable_until:
+                if self.acquire(full_key):
+                    try:
+                        return self.recompute(
+                            full_key, compute, ttl, stale_ttl
+                        )
+                    finally:
+                        self.release(full_key)
+                return value
+        with self.key_lock(full_key):
+            return self.compute_once(full_key, compute, ttl, stale_ttl)
+
+    def compute_once(self, full_key, compute, ttl, stale_ttl):
+        # Другой поток процесса мог уже посчитать значение, пока мы ждали.
+        entry = self.lookup(full_key)
+        if entry is not None and time.time() < entry[2]:
+            return entry[0]
+        deadline = time.monotonic() + self.lock_timeout
+        while not self.acquire(full_key):
+            if time.monotonic() > deadline:
+                return self.recompute(full_key, compute, ttl, stale_ttl)
+            time.sleep(0.05)
+            entry = self.shared.get(full_key)
+            if entry is not None and time.time() < entry[2]:
+                self.local.set(full_key, entry)
+                return entry[0]
+        try:
+            return self.recompute(full_key, compute, ttl, stale_ttl)
+        finally:
+            self.release(full_key)
+
+
+feed_cache = TwoTierCache()
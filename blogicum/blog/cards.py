@@ -0,0 +1,101 @@
+from django.template.defaultfilters import date
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+from django.utils.timezone import localtime
+
+from .snapshots import categories, locations
+from .urlbuilder import blog_urls
+
+IMAGE = (
+    "\n"
+    '        <a href="{url}" target="_blank">\n'
+    '          <img class="border-3 rounded img-fluid img-thumbnail mb-2 '
+    'mx-auto d-block" src="{url}">\n'
+    "        </a>\n"
+    "      "
+)
+POST_HIDDEN = (
+    "\n"
+    '            <p class="text-danger">Пост снят с публикации админом</p>\n'
+    "          "
+)
+CATEGORY_HIDDEN = (
+    "\n"
+    '            <p class="text-danger">Выбранная категория снята с '
+    "публикации админом</p>\n"
+    "          "
+)
+CATEGORY_LINK = (
+    '<a class="text-muted" href="{url}">\n'
+    "  {title}\n"
+    "</a>"
+)
+CARD = (
+    '<div class="col d-flex justify-content-center">\n'
+    '  <div class="card" style="width: 40rem;">\n'
+    '    <div class="card-body">\n'
+    "      {image}\n"
+    '      <h5 class="card-title">{title}</h5>\n'
+    '      <h6 class="card-subtitle mb-2 text-muted">\n'
+    "        <small>\n"
+    "          {notice}\n"
+    "          {pub_date} | {location}<br>\n"
+    '          От автора <a class="text-muted" href="{profile_url}">'
+    "@{username}</a> в\n"
+    "          категории {category_link}\n"
+    "        </small>\n"
+    "      </h6>\n"
+    '      <p class="card-text">{excerpt}</p>\n'
+    '      <a href="{detail_url}" class="card-link">Читать полный текст</a>\n'
+    '      <a href="{detail_url}" class="card-link text-muted">'
+    "Комментарии ({comment_count})</a>\n"
+    "    </div>\n"
+    "  </div>\n"
+    "</div>"
+)
+
+
+def render_post_card(post):
+    """Карточка публикации, байт в байт как ``includes/post_card.html``.
+
+    Шаблон с вложенным ``category_link.html`` остаётся эталоном: при его
+    изменении нужно поправить и эту функцию, расхождение ловят тесты.
+    """
+    escape = conditional_escape
+    category = categories.get(post.category_id)
+    image = ""
+    if post.image:
+        image = IMAGE.format(url=escape(post.image.url))
+    notice = ""
+    if not post.is_published:
+        notice = POST_HIDDEN
+    elif category is None or not category.is_published:
+        notice = CATEGORY_HIDDEN
+    location = "Планета Земля"
+    if post.shows_location:
+        record = locations.get(post.location_id)
+        location = escape(record.name) if record else ""
+    username = post.author.username
+    # Публикация без категории выводится без ссылки на неё.
+    category_link = ""
+    if category is not None:
+        category_link = CATEGORY_LINK.format(
+            url=escape(blog_urls.url("category_posts", category.slug)),
+            title=escape(category.title),
+        )
+    detail_url = escape(blog_urls.url("post_detail", post.id))
+    return mark_safe(
+        CARD.format(
+            image=image,
+            title=escape(post.title),
+            notice=notice,
+            pub_date=escape(date(localtime(post.pub_date), "d E Y, H:i")),
+            location=location,
+            profile_url=escape(blog_urls.url("profile", username)),
+            username=escape(username),
+            category_link=category_link,
+            excerpt=escape(post.excerpt),
+            detail_url=detail_url,
+            comment_count=escape(post.comment_count),
+        )
+    )
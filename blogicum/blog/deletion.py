@@ -0,0 +1,115 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import Comment, Post, Tombstone
+from .signals import muted, publish_change
+
+User = get_user_model()
+
+
+def tombstone_post(post):
+    """Скрывает публикацию сразу, а удаление оставляет фоновой команде."""
+    with transaction.atomic():
+        Post.all_objects.filter(pk=post.pk).update(is_deleted=True)
+        Tombstone.objects.get_or_create(post_id=post.pk)
+    publish_change(Post, post.pk)
+
+
+def tombstone_user(user):
+    with transaction.atomic():
+        User.objects.filter(pk=user.pk).update(is_active=False)
+        Post.all_objects.filter(author_id=user.pk).update(is_deleted=True)
+        Comment.all_objects.filter(author_id=user.pk).update(is_deleted=True)
+        Tombstone.objects.get_or_create(user_id=user.pk)
+    publish_change(User, user.pk)
+    publish_change(Post, "")
+    publish_change(Comment, "")
+
+
+def delete_in_batches(queryset, batch_size, pause=0, before_delete=None):
+    """Удаляет строки пачками по первичному ключу.
+
+    Возвращает генератор, отдающий число удалённых на каждом шаге строк.
+    Обработчики сигналов моделей на время удаления отключены: о
+    результате кэшам сообщает вызывающий код.
+    """
+    manager = queryset.model._base_manager
+    while True:
+        pks = list(
+            queryset.order_by("pk").values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            return
+        batch = manager.filter(pk__in=pks)
+        with transaction.atomic():
+            if before_delete is not None:
+                before_delete(batch)
+            with muted():
+                batch.delete()
+        yield len(pks)
+        if pause:
+            time.sleep(pause)
+
+
+def delete_images(posts):
+    images = [post.image for post in posts.only("pk", "image") if post.image]
+
+    def delete_files():
+        for image in images:
+            image.storage.delete(image.name)
+
+    # Файлы удаляем только после фиксации транзакции с удалением строк.
+    transaction.on_commit(delete_files)
+
+
+def purge_steps(tombstone):
+    """Перечисляет этапы очистки: (название, queryset, подготовка)."""
+    if tombstone.post_id:
+        posts = Post.all_objects.filter(pk=tombstone.post_id)
+        return [
+            (
+                "комментарии",
+                Comment.all_objects.filter(post_id=tombstone.post_id),
+                None,
+            ),
+            ("публикация", posts, delete_images),
+        ]
+    posts = Post.all_objects.filter(author_id=tombstone.user_id)
+    return [
+        (
+            "комментарии пользователя",
+            Comment.all_objects.filter(author_id=tombstone.user_id),
+            None,
+        ),
+        (
+            "комментарии к публикациям",
+            Comment.all_objects.filter(post__author_id=tombstone.user_id),
+            None,
+        ),
+        ("публикации", posts, delete_images),
+        ("пользователь", User.objects.filter(pk=tombstone.user_id), None),
+    ]
+
+
+def purge_tombstone(tombstone, batch_size=500, pause=0):
+    """Очищает зависимые объекты пачками и отдаёт прогресс.
+
+    Генератор отдаёт кортежи ``(этап, удалено, всего)``.
+    """
+    for stage, queryset, before_delete in purge_steps(tombstone):
+        total = queryset.count()
+        done = 0
+        for deleted in delete_in_batches(
+            queryset, batch_size, pause, before_delete
+        ):
+            done += deleted
+            yield stage, done, total
+    Tombstone.objects.filter(pk=tombstone.pk).delete()
+    if tombstone.post_id:
+        publish_change(Post, tombstone.post_id)
+    else:
+        publish_change(User, tombstone.user_id)
+        publish_change(Post, "")
+        publish_change(Comment, "")
@@ -0,0 +1,173 @@
+import hashlib
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+
+from .metrics import metrics
+from .models import Category, Post
+
+User = get_user_model()
+
+
+class BloomFilter:
+    """Множество без ложных отрицаний и с долей ложных срабатываний."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(capacity, 1)
+        size = -self.capacity * math.log(error_rate) / math.log(2) ** 2
+        self.size = max(int(size), 8)
+        self.hashes = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        digest = hashlib.blake2b(str(key).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+
+class ExistenceFilter:
+    """Фильтр Блума существующих значений поля модели.
+
+    Фильтр строится по базе при первом обращении и лежит в общем кэше
+    вместе с номером версии; процесс держит копию и перечитывает её,
+    когда номер меняется. Новые значения добавляются в общий фильтр
+    сразу при сохранении, поэтому отрицательный ответ фильтра надёжен
+    и запрос к базе можно не делать. Удалённые значения остаются в
+    фильтре и просто доходят до базы.
+    """
+
+    def __init__(self, name, values, alias="blog", lock_timeout=10):
+        self.name = name
+        self.values = values
+        self.alias = alias
+        self.lock_timeout = lock_timeout
+        self.local = (None, None)
+        self.lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    @property
+    def key(self):
+        return f"exists:{self.name}"
+
+    @contextmanager
+    def locked(self):
+        deadline = time.monotonic() + self.lock_timeout
+        acquired = self.shared.add(f"lock:{self.key}", 1, self.lock_timeout)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(0.05)
+            acquired = self.shared.add(
+                f"lock:{self.key}", 1, self.lock_timeout
+            )
+        try:
+            yield
+        finally:
+            if acquired:
+                self.shared.delete(f"lock:{self.key}")
+
+    def store(self, bloom):
+        version = max(
+            self.shared.get(f"{self.key}:version", 0) + 1,
+            int(time.time() * 1000),
+        )
+        self.shared.set(self.key, (version, bloom), timeout=None)
+        self.shared.set(f"{self.key}:version", version, timeout=None)
+        return version
+
+    def build(self):
+        values = list(self.values())
+        # Запас в два раза, чтобы фильтр не перестраивался после каждой
+        # новой записи.
+        bloom = BloomFilter(len(values) * 2)
+        for value in values:
+            bloom.add(value)
+        return self.store(bloom), bloom
+
+    def load(self):
+        version = self.shared.get(f"{self.key}:version")
+        local_version, bloom = self.local
+        if version is not None and version == local_version:
+            return bloom
+        with self.lock:
+            entry = self.shared.get(self.key)
+            if entry is None:
+                with self.locked():
+                    entry = self.shared.get(self.key) or self.build()
+            self.local = entry
+        return entry[1]
+
+    def might_exist(self, value):
+        return str(value) in self.load()
+
+    def add(self, value):
+        with self.locked():
+            entry = self.shared.get(self.key)
+            if entry is None:
+                # Фильтр построится из базы при следующем обращении, а
+                # процессы с устаревшей копией перечитают его.
+                self.shared.delete(f"{self.key}:version")
+                return
+            bloom = entry[1]
+            if bloom.count >= bloom.capacity:
+                self.local = self.build()
+                return
+            bloom.add(value)
+            self.local = (self.store(bloom), bloom)
+
+    def add_on_commit(self, value):
+        # Фильтр, построенный другим процессом до фиксации транзакции,
+        # не увидит новую запись, поэтому добавляем её ещё раз.
+        self.add(value)
+        transaction.on_commit(lambda: self.add(value))
+
+
+FILTERS = {
+    ("blog.post", "pk"): ExistenceFilter(
+        "post", lambda: Post.all_objects.values_list("pk", flat=True)
+    ),
+    ("blog.category", "slug"): ExistenceFilter(
+        "category", lambda: Category.objects.values_list("slug", flat=True)
+    ),
+    (User._meta.label_lower, "username"): ExistenceFilter(
+        "user", lambda: User.objects.values_list("username", flat=True)
+    ),
+}
+
+
+def surely_missing(model, field, value):
+    """Истинно, если объекта с таким значением поля точно нет в базе."""
+    existence = FILTERS.get((model._meta.label_lower, field))
+    if existence is None or existence.might_exist(value):
+        return False
+    metrics.incr(f"existence.{existence.name}.rejected")
+    return True
+
+
+def note_saved(model, instance, created, update_fields=None):
+    label = model._meta.label_lower
+    for (filter_label, field), existence in FILTERS.items():
+        if filter_label != label or (field == "pk" and not created):
+            continue
+        if update_fields is not None and field not in update_fields:
+            continue
+        existence.add_on_commit(getattr(instance, field))
@@ -0,0 +1,200 @@
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.timezone import now
+
+from .models import Post
+from .snapshots import categories
+from .visibility import LISTED_MASKS
+
+ROW = (
+    "pk",
+    "pub_date",
+    "category_id",
+    "author_id",
+    "is_published",
+    "is_deleted",
+)
+
+
+def feeds_of(category_id, author_id):
+    feeds = ["index", f"profile:{author_id}"]
+    if category_id is not None:
+        feeds.append(f"category:{category_id}")
+    return feeds
+
+
+def is_visible(feed, row):
+    _, _, category_id, author_id, is_published, is_deleted = row
+    if feed not in feeds_of(category_id, author_id):
+        return False
+    if not is_published or is_deleted:
+        return False
+    if feed == "index":
+        return category_id in categories.published_ids()
+    return True
+
+
+class FeedIndex:
+    """Упорядоченные списки id публикаций для каждой ленты.
+
+    Лента главной страницы, каждой категории и каждого автора хранится
+    в общем кэше как два массива: отрицательные отметки времени
+    публикации и id в порядке ``-pub_date``. Отложенные публикации тоже
+    лежат в списке и отсекаются при чтении двоичным поиском по времени,
+    так что к моменту публикации ничего пересчитывать не нужно.
+
+    Изменение публикации удаляет её id из затронутых лент и вставляет
+    на нужное место, если публикация видна. Ещё не построенные ленты
+    строятся из базы при первом чтении.
+    """
+
+    def __init__(self, alias="blog", lock_timeout=10):
+        self.alias = alias
+        self.lock_timeout = lock_timeout
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def generation(self):
+        generation = self.shared.get("feedindex:generation")
+        if generation is None:
+            generation = int(time.time() * 1000)
+            if not self.shared.add(
+                "feedindex:generation", generation, timeout=None
+            ):
+                generation = self.shared.get(
+                    "feedindex:generation", generation
+                )
+        return generation
+
+    def key(self, feed):
+        return f"feedindex:{self.generation()}:{feed}"
+
+    @contextmanager
+    def locked(self, key):
+        deadline = time.monotonic() + self.lock_timeout
+        acquired = self.shared.add(f"lock:{key}", 1, self.lock_timeout)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(0.05)
+            acquired = self.shared.add(f"lock:{key}", 1, self.lock_timeout)
+        try:
+            yield
+        finally:
+            if acquired:
+                self.shared.delete(f"lock:{key}")
+
+    def queryset(self, feed):
+        if feed == "index":
+            return Post.objects.filter(visibility__in=LISTED_MASKS)
+        queryset = Post.objects.filter(is_published=True)
+        kind, pk = feed.split(":")
+        if kind == "category":
+            return queryset.filter(category_id=pk)
+        return queryset.filter(author_id=pk)
+
+    def build(self, feed):
+        rows = self.queryset(feed).order_by("-pub_date", "-pk")
+        stamps, ids = array("d"), array("q")
+        for pk, pub_date in rows.values_list("pk", "pub_date"):
+            stamps.append(-pub_date.timestamp())
+            ids.append(pk)
+        self.shared.set(self.key(feed), (stamps, ids), timeout=None)
+        return stamps, ids
+
+    def load(self, feed):
+        entries = self.shared.get(self.key(feed))
+        if entries is None:
+            with self.locked(self.key(feed)):
+                entries = self.shared.get(self.key(feed))
+                if entries is None:
+                    entries = self.build(feed)
+        return entries
+
+    def page(self, feed, number, per_page):
+        """Возвращает id публикаций страницы, её номер и длину ленты."""
+        stamps, ids = self.load(feed)
+        start = bisect_left(stamps, -now().timestamp())
+        count = len(ids) - start
+        num_pages = max((count + per_page - 1) // per_page, 1)
+        number = min(max(number, 1), num_pages)
+        offset = start + (number - 1) * per_page
+        return list(ids[offset:offset + per_page]), number, count
+
+    def previous_feeds(self, pk):
+        """Ленты, в которые публикация входит до сохранения."""
+        row = (
+            Post.all_objects.filter(pk=pk)
+            .values_list("category_id", "author_id")
+            .first()
+        )
+        return feeds_of(*row) if row else []
+
+    def move(self, feed, pk, row):
+        key = self.key(feed)
+        with self.locked(key):
+            entries = self.shared.get(key)
+            if entries is None:
+                return
+            stamps, ids = entries
+            if pk in ids:
+                position = ids.index(pk)
+                del stamps[position]
+                del ids[position]
+            if row is not None and is_visible(feed, row):
+                stamp = -row[1].timestamp()
+                position = bisect_left(stamps, stamp)
+                end = bisect_right(stamps, stamp)
+                while position < end and ids[position] > pk:
+                    position += 1
+                stamps.insert(position, stamp)
+                ids.insert(position, pk)
+            self.shared.set(key, (stamps, ids), timeout=None)
+
+    def update(self, pk, previous=()):
+        row = Post.all_objects.filter(pk=pk).values_list(*ROW).first()
+        feeds = set(previous)
+        if row is not None:
+            feeds.update(feeds_of(row[2], row[3]))
+        for feed in feeds:
+            self.move(feed, pk, row)
+
+    def update_on_commit(self, pk, previous=()):
+        # Как и кэш лент, обновляем сразу и ещё раз после фиксации.
+        self.update(pk, previous)
+        transaction.on_commit(lambda: self.update(pk, previous))
+
+    def post_changed(self, pk, instance=None):
+        """Обновляет ленты после изменения публикации.
+
+        Пустой ``pk`` означает массовое изменение: все ленты
+        перестраиваются заново.
+        """
+        if pk in ("", None):
+            self.clear()
+            return
+        previous = []
+        if instance is not None:
+            previous = getattr(instance, "_previous_feeds", []) + feeds_of(
+                instance.category_id, instance.author_id
+            )
+        self.update_on_commit(pk, previous)
+
+    def drop(self, feed):
+        self.shared.delete(self.key(feed))
+        transaction.on_commit(lambda: self.shared.delete(self.key(feed)))
+
+    def clear(self):
+        generation = max(
+            self.shared.get("feedindex:generation", 0) + 1,
+            int(time.time() * 1000),
+        )
+        self.shared.set("feedindex:generation", generation, timeout=None)
+
+
+feed_index = FeedIndex()
@@ -0,0 +1,97 @@
+from collections import namedtuple
+
+from django.core.files.storage import default_storage
+
+from .visibility import LOCATION
+
+AuthorRow = namedtuple("AuthorRow", ["id", "username"])
+ImageRow = namedtuple("ImageRow", ["name", "url"])
+
+COLUMNS = (
+    "id",
+    "title",
+    "excerpt",
+    "pub_date",
+    "image",
+    "is_published",
+    "category_id",
+    "location_id",
+    "author_id",
+    "author__username",
+    "comment_count",
+    "visibility",
+)
+
+
+class FeedRow:
+    """Публикация в ленте: только то, что выводит ``post_card.html``.
+
+    В отличие от объекта модели здесь нет ``_state``, остальных полей и
+    дескрипторов связей. Категория и место берутся шаблоном из снимков
+    справочников по ``category_id`` и ``location_id``.
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "excerpt",
+        "pub_date",
+        "image",
+        "is_published",
+        "category_id",
+        "location_id",
+        "author",
+        "comment_count",
+        "visibility",
+    )
+
+    def __init__(
+        self,
+        id,
+        title,
+        excerpt,
+        pub_date,
+        image,
+        is_published,
+        category_id,
+        location_id,
+        author_id,
+        author_username,
+        comment_count,
+        visibility,
+    ):
+        self.id = id
+        self.title = title
+        self.excerpt = excerpt
+        self.pub_date = pub_date
+        self.image = image and ImageRow(image, default_storage.url(image))
+        self.is_published = is_published
+        self.category_id = category_id
+        self.location_id = location_id
+        self.author = AuthorRow(author_id, author_username)
+        self.comment_count = comment_count
+        self.visibility = visibility
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def author_id(self):
+        return self.author.id
+
+    @property
+    def shows_location(self):
+        return bool(self.visibility & LOCATION)
+
+
+def feed_rows(queryset):
+    """Строки ленты из запроса с аннотацией ``comment_count``."""
+    return [FeedRow(*row) for row in queryset.values_list(*COLUMNS)]
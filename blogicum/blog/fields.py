@@ -0,0 +1,69 @@
+import base64
+import zlib
+
+from django.db import models
+
+COMPRESSED_MARKER = "\x01z:"
+RAW_MARKER = "\x01r:"
+
+
+def compress_text(value, min_length, level):
+    data = value.encode("utf-8")
+    if len(data) >= min_length:
+        packed = base64.b85encode(zlib.compress(data, level)).decode("ascii")
+        if len(packed) + len(COMPRESSED_MARKER) < len(data):
+            return COMPRESSED_MARKER + packed
+    if value.startswith("\x01"):
+        # Текст, случайно начинающийся с маркера, экранируем.
+        return RAW_MARKER + value
+    return value
+
+
+def decompress_text(value):
+    if value.startswith(COMPRESSED_MARKER):
+        packed = value[len(COMPRESSED_MARKER):].encode("ascii", "replace")
+        try:
+            return zlib.decompress(base64.b85decode(packed)).decode("utf-8")
+        except (ValueError, zlib.error):
+            # Строка, записанная до появления сжатия и похожая на маркер.
+            return value
+    if value.startswith(RAW_MARKER):
+        return value[len(RAW_MARKER):]
+    return value
+
+
+class CompressedTextField(models.TextField):
+    """Текстовое поле, сжимающее длинные значения zlib при записи.
+
+    Значения короче ``min_length`` байт хранятся как есть, поэтому строки,
+    записанные обычным ``TextField``, читаются без преобразования. Поиск
+    по содержимому (``icontains`` и т.п.) по сжатым строкам не работает.
+    """
+
+    def __init__(self, *args, min_length=512, level=6, **kwargs):
+        self.min_length = min_length
+        self.level = level
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.min_length != 512:
+            kwargs["min_length"] = self.min_length
+        if self.level != 6:
+            kwargs["level"] = self.level
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return decompress_text(value)
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None:
+            return value
+        return compress_text(value, self.min_length, self.level)
+
+
+class RenderedHTMLField(CompressedTextField):
+    """HTML, заранее отрендеренный из текстового поля модели."""
@@ -0,0 +1,73 @@
+import hashlib
+
+from django import forms
+from django.utils import translation
+from django.utils.safestring import mark_safe
+from django_bootstrap5.forms import render_form
+
+from .cache import TwoTierCache
+from .query_cache import query_cache
+
+form_cache = TwoTierCache(max_entries=100)
+
+
+def is_cacheable(form):
+    # Связанная форма показывает введённые данные и ошибки, а форма
+    # редактирования — значения конкретного объекта.
+    if form.is_bound:
+        return False
+    instance = getattr(form, "instance", None)
+    return instance is None or instance.pk is None
+
+
+def choice_tables(form):
+    return sorted(
+        {
+            field.queryset.model._meta.db_table
+            for field in form.fields.values()
+            if isinstance(field, forms.ModelChoiceField)
+        }
+    )
+
+
+def form_key(form, options):
+    """Ключ разметки: класс формы, язык, начальные значения и параметры.
+
+    Варианты полей выбора берутся из базы, поэтому в ключ входят и
+    версии их таблиц из кэша запросов.
+    """
+    versions = ",".join(
+        f"{table}={query_cache.tier.version(query_cache.namespace(table))}"
+        for table in choice_tables(form)
+    )
+    digest = hashlib.sha1(
+        repr(
+            (
+                sorted(form.initial.items()),
+                form.prefix,
+                form.auto_id,
+                sorted(options.items()),
+            )
+        ).encode()
+    ).hexdigest()
+    form_class = f"{type(form).__module__}.{type(form).__qualname__}"
+    language = translation.get_language()
+    return f"{form_class}:{language}:{versions}:{digest}"
+
+
+def render_cached_form(form, **options):
+    """Разметка формы как у ``{% bootstrap_form %}``.
+
+    Для пустых форм разметка рендерится один раз и берётся из кэша.
+    Значения конкретного запроса, вроде токена CSRF, в неё не входят и
+    подставляются шаблоном вокруг формы.
+    """
+    if not is_cacheable(form):
+        return render_form(form, **options)
+    html = form_cache.get_or_compute(
+        "form",
+        form_key(form, options),
+        lambda: str(render_form(form, **options)),
+        ttl=600,
+    )
+    return mark_safe(html)
@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth.models import User
 
 from .models import Post, Comment
+from .widgets import location_widget
 
 
 class PostForm(forms.ModelForm):
@@ -10,6 +11,8 @@ class PostForm(forms.ModelForm):
         fields = ["title", "text", "image", "pub_date", "category", "location"]
         widgets = {
             "pub_date": forms.DateTimeInput(attrs={"type": "datetime-local"}),
+            # Мест десятки тысяч: вместо списка — поиск по названию.
+            "location": location_widget(),
         }
 
 
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.template.defaultfilters import date
+from django.template.loader import get_template
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
+from django.utils.timezone import template_localtime
+from django_bootstrap5.templatetags.django_bootstrap5 import bootstrap_css
+from jinja2 import Environment, pass_context
+from markupsafe import Markup
+
+from .cards import render_post_card
+from .page_cache import is_owner
+from .snapshots import categories, locations
+from .urlbuilder import blog_urls
+
+ENGINE = "jinja2"
+
+
+def finalize(value):
+    # Значения выводятся как в шаблонах Django: с локализацией дат и
+    # чисел и тем же экранированием, что и ``{{ value }}``.
+    return conditional_escape(localize(template_localtime(value)))
+
+
+def local_date(value, arg=None):
+    return date(template_localtime(value), arg)
+
+
+def url(name, *args, **kwargs):
+    return reverse(name, args=args or None, kwargs=kwargs or None)
+
+
+@pass_context
+def hole(context, template_name, owner=None, **values):
+    """То же, что тег ``{% hole %}``.
+
+    Сами дырки остаются шаблонами Django: они рендерятся отдельно для
+    каждого посетителя функцией ``fill_holes``.
+    """
+    hole_punch = context.get("hole_punch")
+    if hole_punch is not None:
+        return Markup(hole_punch.punch(template_name, values, owner))
+    if not is_owner(context.get("user"), owner):
+        return ""
+    included = get_template(template_name, using="django")
+    return Markup(
+        included.render(
+            {**context.get_all(), **values}, context.get("request")
+        )
+    )
+
+
+def environment(**options):
+    """Окружение Jinja2 с функциями и фильтрами из ``blog_tags``."""
+    env = Environment(finalize=finalize, **options)
+    env.globals.update(
+        blog_url=blog_urls.url,
+        bootstrap_css=bootstrap_css,
+        hole=hole,
+        post_card=render_post_card,
+        static=static,
+        url=url,
+    )
+    env.filters.update(
+        category_of=lambda post: categories.get(post.category_id),
+        date=local_date,
+        location_of=lambda post: locations.get(post.location_id),
+    )
+    return env
+
+
+class TemplateEngineMixin:
+    """Выбирает движок шаблонов по настройке ``BLOG_JINJA2_VIEWS``.
+
+    Шаблоны для Jinja2 лежат в ``jinja2/`` под теми же именами, что и
+    шаблоны Django в ``templates/``.
+    """
+
+    @property
+    def template_engine(self):
+        view_name = self.request.resolver_match.view_name
+        if view_name in settings.BLOG_JINJA2_VIEWS:
+            return ENGINE
+        return None
+
+    def page_cache_key(self):
+        key = super().page_cache_key()
+        if key and self.template_engine:
+            key = f"{key}:{self.template_engine}"
+        return key
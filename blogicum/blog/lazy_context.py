@@ -0,0 +1,90 @@
+import functools
+import time
+
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates as DjangoBackend
+from django.template.backends.jinja2 import Jinja2 as Jinja2Backend
+from django.template.context import _builtin_context_processors
+from django.utils.functional import SimpleLazyObject, cached_property
+from django.utils.module_loading import import_string
+
+from .metrics import metrics
+
+# Ключи, которые возвращают процессоры. Процессоры не из этого списка
+# вызываются сразу, как обычно.
+LAZY_KEYS = {
+    "django.template.context_processors.debug": ("debug", "sql_queries"),
+    "django.contrib.auth.context_processors.auth": ("user", "perms"),
+    "django.contrib.messages.context_processors.messages": (
+        "messages",
+        "DEFAULT_MESSAGE_LEVELS",
+    ),
+}
+
+
+class LazyProcessor:
+    """Контекстный процессор, который вызывается при первом чтении.
+
+    Вместо значений в контекст попадают ленивые объекты; сам процессор
+    вызывается один раз за запрос, когда шаблон обратится к любому из
+    его ключей. Время каждого вызова попадает в метрики как
+    ``context.<имя>``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.name = path.rsplit(".", 1)[-1]
+        self.processor = import_string(path)
+        self.keys = LAZY_KEYS.get(path)
+        # Панель шаблонов debug_toolbar подписывает процессоры по имени.
+        functools.update_wrapper(self, self.processor)
+
+    def compute(self, request):
+        started = time.perf_counter()
+        try:
+            return self.processor(request)
+        finally:
+            metrics.observe(
+                f"context.{self.name}", time.perf_counter() - started
+            )
+
+    def __call__(self, request):
+        if self.keys is None or not settings.BLOG_LAZY_CONTEXT:
+            return self.compute(request)
+        # Дырки страницы рендерятся отдельно, но в рамках одного запроса
+        # процессор всё равно вызывается не больше раза.
+        computed = request.__dict__.setdefault("_lazy_context", {})
+
+        def values():
+            if self.path not in computed:
+                computed[self.path] = self.compute(request)
+            return computed[self.path]
+
+        # Процессор debug вне INTERNAL_IPS ключей не возвращает, а
+        # отсутствующая переменная в шаблоне выводится пустой строкой.
+        return {
+            key: SimpleLazyObject(lambda key=key: values().get(key, ""))
+            for key in self.keys
+        }
+
+
+def lazy_processors(paths):
+    return tuple(LazyProcessor(path) for path in paths)
+
+
+class DjangoTemplates(DjangoBackend):
+    """Шаблоны Django с ленивыми контекстными процессорами."""
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.engine.template_context_processors = lazy_processors(
+            _builtin_context_processors + tuple(self.engine.context_processors)
+        )
+
+
+class Jinja2(Jinja2Backend):
+    """Jinja2 с ленивыми контекстными процессорами."""
+
+    @cached_property
+    def template_context_processors(self):
+        return lazy_processors(self.context_processors)
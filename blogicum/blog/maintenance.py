@@ -0,0 +1,102 @@
+import sqlite3
+
+from django.core.management.base import CommandError
+from django.db import connections
+from django.utils.timezone import now
+
+from .models import DatabaseSizeSample
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def sqlite_connection(alias="default"):
+    connection = connections[alias]
+    if connection.vendor != "sqlite":
+        raise CommandError("Команда работает только с базой SQLite.")
+    connection.ensure_connection()
+    return connection
+
+
+def backup(target, alias="default", pages=256, sleep=0.05, progress=None):
+    """Копирует базу онлайн-API резервного копирования SQLite.
+
+    Копирование идёт шагами по ``pages`` страниц; между шагами блокировка
+    отпускается на ``sleep`` секунд, и пишущие запросы не ждут окончания
+    всей копии. Если во время копирования база изменилась, SQLite сам
+    начинает проход заново.
+    """
+    connection = sqlite_connection(alias)
+    destination = sqlite3.connect(str(target))
+    try:
+        with destination:
+            connection.connection.backup(
+                destination, pages=pages, progress=progress, sleep=sleep
+            )
+    finally:
+        destination.close()
+
+
+def pragma(cursor, name):
+    cursor.execute(f"PRAGMA {name}")
+    return cursor.fetchone()[0]
+
+
+def optimize(alias="default", full=False):
+    with sqlite_connection(alias).cursor() as cursor:
+        if full:
+            cursor.execute("ANALYZE")
+        cursor.execute("PRAGMA optimize")
+
+
+def enable_incremental_vacuum(alias="default"):
+    # Режим auto_vacuum меняется только вместе с полным VACUUM.
+    with sqlite_connection(alias).cursor() as cursor:
+        cursor.execute(f"PRAGMA auto_vacuum = {AUTO_VACUUM_INCREMENTAL}")
+        cursor.execute("VACUUM")
+
+
+def incremental_vacuum(alias="default", pages=1000):
+    """Возвращает в файловую систему до ``pages`` свободных страниц.
+
+    Если в базе не включён режим ``auto_vacuum=INCREMENTAL``, возвращает
+    ``None``.
+    """
+    with sqlite_connection(alias).cursor() as cursor:
+        if pragma(cursor, "auto_vacuum") != AUTO_VACUUM_INCREMENTAL:
+            return None
+        before = pragma(cursor, "freelist_count")
+        cursor.execute(f"PRAGMA incremental_vacuum({int(pages)})")
+        cursor.fetchall()
+        return before - pragma(cursor, "freelist_count")
+
+
+def record_sizes(alias="default"):
+    """Сохраняет размеры таблиц и индексов и возвращает новые замеры."""
+    with sqlite_connection(alias).cursor() as cursor:
+        cursor.execute(
+            "SELECT dbstat.name, COALESCE(sqlite_master.type, 'table'), "
+            "SUM(dbstat.pgsize) FROM dbstat "
+            "LEFT JOIN sqlite_master ON sqlite_master.name = dbstat.name "
+            "GROUP BY dbstat.name ORDER BY dbstat.name"
+        )
+        rows = cursor.fetchall()
+    taken_at = now()
+    return DatabaseSizeSample.objects.bulk_create(
+        DatabaseSizeSample(name=name, kind=kind, size=size, taken_at=taken_at)
+        for name, kind, size in rows
+    )
+
+
+def previous_sizes(before):
+    previous = (
+        DatabaseSizeSample.objects.filter(taken_at__lt=before)
+        .values_list("taken_at", flat=True)
+        .first()
+    )
+    if previous is None:
+        return {}
+    return dict(
+        DatabaseSizeSample.objects.filter(taken_at=previous).values_list(
+            "name", "size"
+        )
+    )
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from blog.maintenance import backup
+
+
+class Command(BaseCommand):
+    help = (
+        "Создаёт резервную копию базы SQLite онлайн, небольшими шагами, "
+        "не останавливая запись в базу."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=None)
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=256,
+            help="Сколько страниц копировать за шаг.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.05,
+            help="Пауза между шагами в секундах.",
+        )
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=None,
+            help="Сколько последних копий хранить в каталоге копий.",
+        )
+
+    def handle(self, *args, **options):
+        backup_dir = Path(settings.DB_BACKUP_DIR)
+        if options["output"]:
+            target = Path(options["output"])
+        else:
+            backup_dir.mkdir(parents=True, exist_ok=True)
+            stamp = now().strftime("%Y%m%d-%H%M%S")
+            target = backup_dir / f"db-{stamp}.sqlite3"
+
+        def progress(status, remaining, total):
+            self.stdout.write(f"скопировано {total - remaining}/{total}")
+
+        backup(
+            target,
+            pages=options["pages"],
+            sleep=options["sleep"],
+            progress=progress if options["verbosity"] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Копия сохранена: {target}"))
+
+        if options["keep"] and not options["output"]:
+            backups = sorted(backup_dir.glob("db-*.sqlite3"), reverse=True)
+            for old in backups[options["keep"]:]:
+                old.unlink()
+                self.stdout.write(f"Удалена старая копия: {old}")
@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.utils.timezone import now
+
+from blog.benchmarks import make_text, measure, rolled_back
+from blog.models import Category, Post
+from blog.views import COMMENT_COUNT
+
+User = get_user_model()
+
+INCLUDE = Template(
+    "{% for post in posts %}"
+    '{% include "includes/post_card.html" %}'
+    "{% endfor %}"
+)
+COMPILED = Template(
+    "{% load blog_tags %}"
+    "{% for post in posts %}{% post_card post %}{% endfor %}"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время рендеринга страницы из 10, 50 и 100 карточек "
+        "через include шаблона и через тег post_card. Все данные "
+        "создаются во временной транзакции и откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            author = User.objects.create(username="bench_cards")
+            category = Category.objects.create(
+                title="bench", description="bench", slug="bench-cards"
+            )
+            for i in range(100):
+                Post.objects.create(
+                    title=f"Публикация {i}",
+                    text=make_text(50, seed=i),
+                    pub_date=now(),
+                    author=author,
+                    category=category,
+                )
+            posts = list(
+                Post.objects.filter(author=author)
+                .select_related("author")
+                .annotate(comment_count=COMMENT_COUNT)
+            )
+            for size in (10, 50, 100):
+                context = Context({"posts": posts[:size]})
+                include, _ = measure(
+                    lambda: INCLUDE.render(context), options["repeat"]
+                )
+                compiled, _ = measure(
+                    lambda: COMPILED.render(context), options["repeat"]
+                )
+                self.stdout.write(
+                    f"{size:>3} карточек: include {include:.2f} мс, "
+                    f"post_card {compiled:.2f} мс "
+                    f"({include / compiled:.1f}x)"
+                )
@@ -0,0 +1,74 @@
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+from django.utils.timezone import now
+
+from blog.benchmarks import make_text, measure, rolled_back
+from blog.feed_rows import feed_rows
+from blog.models import Category, Post
+from blog.views import COMMENT_COUNT
+
+User = get_user_model()
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает память и время на страницу ленты для объектов Post и "
+        "для лёгких записей FeedRow. Все данные создаются во временной "
+        "транзакции и откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            author = User.objects.create(username="bench_feed_rows")
+            category = Category.objects.create(
+                title="bench", description="bench", slug="bench-feed-rows"
+            )
+            for i in range(options["posts"]):
+                Post.objects.create(
+                    title=f"Публикация {i}",
+                    text=make_text(300, seed=i),
+                    pub_date=now(),
+                    author=author,
+                    category=category,
+                )
+            queryset = (
+                Post.objects.filter(author=author)
+                .select_related("author")
+                .defer("text", "text_html")
+                .annotate(comment_count=COMMENT_COUNT)
+                .order_by("-pub_date")
+            )
+            card = get_template("includes/post_card.html")
+            for per_page in (10, options["posts"]):
+                page = queryset[:per_page]
+                for label, load in (("Post", list), ("FeedRow", feed_rows)):
+                    fetch, _ = measure(
+                        lambda: load(page.all()), options["repeat"]
+                    )
+                    objects = load(page.all())
+                    render, _ = measure(
+                        lambda: [card.render({"post": o}) for o in objects],
+                        options["repeat"],
+                    )
+                    memory = peak_memory(lambda: load(page.all()))
+                    self.stdout.write(
+                        f"{per_page:>4} карточек, {label:<8}: "
+                        f"выборка {fetch:.2f} мс, рендеринг {render:.2f} мс, "
+                        f"память {memory / 1024:.0f} КиБ"
+                    )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django_bootstrap5.forms import render_form
+
+from blog.benchmarks import measure
+from blog.form_cache import form_cache, render_cached_form
+from blog.forms import CommentForm, PostForm
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время рендеринга пустых форм публикации и комментария "
+        "через django_bootstrap5 и через кэш разметки форм."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options):
+        form_cache.clear()
+        for form_class in (CommentForm, PostForm):
+            plain, _ = measure(
+                lambda: render_form(form_class()), options["repeat"]
+            )
+            cached, _ = measure(
+                lambda: render_cached_form(form_class()), options["repeat"]
+            )
+            self.stdout.write(
+                f"{form_class.__name__}: django_bootstrap5 {plain:.3f} мс, "
+                f"из кэша {cached:.3f} мс ({plain / cached:.1f}x)"
+            )
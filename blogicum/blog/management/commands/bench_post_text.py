@@ -0,0 +1,80 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils.timezone import now
+
+from blog.benchmarks import bench_client, make_text, measure, rolled_back
+from blog.models import Category, Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает объём хранимого текста публикаций и время загрузки "
+        "страницы публикации без сжатия и со сжатием. Все данные "
+        "создаются во временной транзакции и откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=200)
+        parser.add_argument("--words", type=int, default=800)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        field = Post._meta.get_field("text")
+        min_length = field.min_length
+        with rolled_back():
+            author = User.objects.create(username="bench_post_text")
+            category = Category.objects.create(
+                title="bench", description="bench", slug="bench-post-text"
+            )
+            field.min_length = sys.maxsize
+            try:
+                Post.objects.bulk_create(
+                    Post(
+                        title=f"Публикация {i}",
+                        text=make_text(options["words"], seed=i),
+                        pub_date=now(),
+                        author=author,
+                        category=category,
+                    )
+                    for i in range(options["posts"])
+                )
+                posts = list(
+                    Post.objects.filter(author=author).order_by("pk")
+                )
+                self.report("без сжатия", posts, options["repeat"])
+            finally:
+                field.min_length = min_length
+            Post.objects.bulk_update(posts, ["text"])
+            self.report("со сжатием", posts, options["repeat"])
+
+    def report(self, label, posts, repeat):
+        table = connection.ops.quote_name(Post._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT SUM(LENGTH(CAST(text AS BLOB))) FROM {table} "
+                "WHERE id BETWEEN %s AND %s",
+                [posts[0].pk, posts[-1].pk],
+            )
+            (text_bytes,) = cursor.fetchone()
+            cursor.execute("PRAGMA page_count")
+            (page_count,) = cursor.fetchone()
+            cursor.execute("PRAGMA freelist_count")
+            (freelist_count,) = cursor.fetchone()
+            cursor.execute("PRAGMA page_size")
+            (page_size,) = cursor.fetchone()
+        client = bench_client()
+        urls = [f"/posts/{post.pk}/" for post in posts[:10]]
+        median, mean = measure(
+            lambda: [client.get(url) for url in urls], repeat
+        )
+        self.stdout.write(
+            f"{label}: текст {text_bytes} байт, "
+            f"база {(page_count - freelist_count) * page_size} байт, "
+            f"страница публикации {median / len(urls):.2f} мс "
+            f"(среднее {mean / len(urls):.2f} мс)"
+        )
@@ -0,0 +1,93 @@
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import now
+
+from blog.benchmarks import bench_client, make_text, rolled_back
+from blog.models import Category, Comment, Post
+from blog.object_cache import object_cache
+from blog.page_cache import page_cache
+from blog.query_cache import query_cache
+
+User = get_user_model()
+
+
+def first_byte_and_memory(client, url):
+    """Время до первой части ответа, полное время и пик памяти."""
+    page_cache.invalidate("page")
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        response = client.get(url)
+        parts = (
+            iter(response.streaming_content)
+            if response.streaming
+            else iter([response.content])
+        )
+        next(parts)
+        first = time.perf_counter() - started
+        for _ in parts:
+            pass
+        total = time.perf_counter() - started
+        return first * 1000, total * 1000, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время до первого байта и пик памяти страницы "
+        "публикации с длинным обсуждением при обычной и потоковой "
+        "отдаче. Все данные создаются во временной транзакции и "
+        "откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--comments", type=int, nargs="+", default=[500, 2000]
+        )
+
+    def handle(self, *args, **options):
+        client = bench_client()
+        with rolled_back():
+            author = User.objects.create(username="bench_streaming")
+            category = Category.objects.create(
+                title="bench", description="bench", slug="bench-streaming"
+            )
+            for count in options["comments"]:
+                post = Post.objects.create(
+                    title=f"Обсуждение на {count}",
+                    text=make_text(300, seed=count),
+                    pub_date=now(),
+                    author=author,
+                    category=category,
+                )
+                Comment.objects.bulk_create(
+                    Comment(
+                        text=make_text(30, seed=i),
+                        text_html=make_text(30, seed=i),
+                        post=post,
+                        author=author,
+                    )
+                    for i in range(count)
+                )
+                url = reverse("blog:post_detail", args=[post.id])
+                for label, threshold in (("обычная", count), ("поток", 0)):
+                    with override_settings(BLOG_STREAM_COMMENTS=threshold):
+                        first, total, memory = first_byte_and_memory(
+                            client, url
+                        )
+                    self.stdout.write(
+                        f"{count:>5} комментариев, {label:<7}: первый "
+                        f"байт {first:.1f} мс, всего {total:.1f} мс, "
+                        f"память {memory / 1024:.0f} КиБ"
+                    )
+            # Кэши не должны пережить откат транзакции.
+            page_cache.invalidate("page")
+            object_cache.invalidate(Post, "")
+            object_cache.invalidate(User, "")
+            query_cache.invalidate(Comment._meta.db_table)
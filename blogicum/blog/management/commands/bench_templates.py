@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.template.loader import get_template
+from django.test import RequestFactory
+from django.utils.timezone import now
+
+from blog.benchmarks import make_text, measure, rolled_back
+from blog.forms import CommentForm
+from blog.jinja import ENGINE
+from blog.models import Category, Comment, Post
+from blog.page_cache import HolePunch
+from blog.views import COMMENT_COUNT
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает пропускную способность шаблонов Django и Jinja2 на "
+        "ленте и на странице публикации с комментариями. Все данные "
+        "создаются во временной транзакции и откатываются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--comments", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            author = User.objects.create(username="bench_templates")
+            category = Category.objects.create(
+                title="bench", description="bench", slug="bench-templates"
+            )
+            for i in range(20):
+                Post.objects.create(
+                    title=f"Публикация {i}",
+                    text=make_text(300, seed=i),
+                    pub_date=now(),
+                    author=author,
+                    category=category,
+                )
+            post = Post.objects.filter(author=author).first()
+            Comment.objects.bulk_create(
+                Comment(
+                    text=make_text(30, seed=i),
+                    text_html=make_text(30, seed=i),
+                    post=post,
+                    author=author,
+                )
+                for i in range(options["comments"])
+            )
+            posts = list(
+                Post.objects.filter(author=author)
+                .select_related("author")
+                .annotate(comment_count=COMMENT_COUNT)
+            )
+            request = RequestFactory().get("/")
+            request.user = AnonymousUser()
+            pages = {
+                "blog/index.html": {
+                    "page_obj": Paginator(posts, 10).page(1),
+                },
+                "blog/detail.html": {
+                    "post": post,
+                    "form": CommentForm(),
+                    "comments": list(
+                        post.comments.select_related("author")
+                    ),
+                },
+            }
+            for name, context in pages.items():
+                timings = {}
+                for engine in ("django", ENGINE):
+                    template = get_template(name, using=engine)
+                    timings[engine], _ = measure(
+                        lambda: template.render(
+                            {**context, "hole_punch": HolePunch()}, request
+                        ),
+                        options["repeat"],
+                    )
+                django, jinja = timings["django"], timings[ENGINE]
+                self.stdout.write(
+                    f"{name:<17}: Django {1000 / django:.0f} стр/с, "
+                    f"Jinja2 {1000 / jinja:.0f} стр/с "
+                    f"({django / jinja:.1f}x)"
+                )
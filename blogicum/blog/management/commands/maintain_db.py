@@ -0,0 +1,76 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog import maintenance
+
+
+class Command(BaseCommand):
+    help = (
+        "Обслуживание базы SQLite: обновляет статистику планировщика, "
+        "освобождает страницы инкрементальной очисткой и записывает "
+        "размеры таблиц и индексов. С --every повторяется по расписанию."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full-analyze",
+            action="store_true",
+            help="Выполнить полный ANALYZE, а не только PRAGMA optimize.",
+        )
+        parser.add_argument(
+            "--vacuum-pages",
+            type=int,
+            default=1000,
+            help="Сколько свободных страниц вернуть за запуск; 0 — не надо.",
+        )
+        parser.add_argument(
+            "--enable-incremental-vacuum",
+            action="store_true",
+            help="Включить auto_vacuum=INCREMENTAL (выполняет VACUUM).",
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            default=None,
+            help="Повторять обслуживание каждые N секунд.",
+        )
+
+    def handle(self, *args, **options):
+        if options["enable_incremental_vacuum"]:
+            maintenance.enable_incremental_vacuum()
+            self.stdout.write("Инкрементальная очистка включена.")
+        while True:
+            self.run_once(options)
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
+
+    def run_once(self, options):
+        started = time.perf_counter()
+        maintenance.optimize(full=options["full_analyze"])
+        self.stdout.write(
+            f"Статистика обновлена за {time.perf_counter() - started:.2f} с"
+        )
+        if options["vacuum_pages"]:
+            freed = maintenance.incremental_vacuum(
+                pages=options["vacuum_pages"]
+            )
+            if freed is None:
+                self.stdout.write(
+                    self.style.WARNING(
+                        "Инкрементальная очистка выключена; запустите "
+                        "команду с --enable-incremental-vacuum."
+                    )
+                )
+            else:
+                self.stdout.write(f"Освобождено страниц: {freed}")
+        samples = maintenance.record_sizes()
+        if not samples:
+            return
+        previous = maintenance.previous_sizes(samples[0].taken_at)
+        for sample in samples:
+            line = f"{sample.kind:<6} {sample.name:<50} {sample.size:>12}"
+            if sample.name in previous:
+                line += f" ({sample.size - previous[sample.name]:+d})"
+            self.stdout.write(line)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.urls import reverse
+
+from blog.benchmarks import bench_client, measure
+from blog.lazy_context import LAZY_KEYS
+from blog.metrics import metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Показывает, сколько раз и как долго выполнялись контекстные "
+        "процессоры на анонимной ленте, с ленивым контекстом и без него."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50)
+
+    def handle(self, *args, **options):
+        client = bench_client()
+        url = reverse("blog:index")
+        # Первый запрос кладёт тело страницы в кэш, дальше на каждый
+        # запрос рендерятся только дырки.
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"Лента ответила {response.status_code}")
+        names = [path.rsplit(".", 1)[-1] for path in LAZY_KEYS]
+        for lazy in (False, True):
+            with override_settings(BLOG_LAZY_CONTEXT=lazy):
+                metrics.reset()
+                median, _ = measure(
+                    lambda: client.get(url), options["requests"]
+                )
+                timings = metrics.snapshot()["timings"]
+            self.stdout.write(
+                f"{'Ленивый' if lazy else 'Обычный'} контекст, "
+                f"запрос {median:.2f} мс:"
+            )
+            for name in names:
+                summary = timings.get(f"context.{name}")
+                calls = summary["count"] if summary else 0
+                total = summary["total"] * 1000 if summary else 0.0
+                self.stdout.write(
+                    f"  {name:<9} вызовов {calls:>4}, всего {total:.2f} мс"
+                )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from blog.deletion import purge_tombstone
+from blog.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Окончательно удаляет помеченные на удаление публикации и "
+        "пользователей вместе с комментариями и изображениями, пачками."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Пауза между пачками в секундах.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Сколько отложенных удалений обработать за запуск.",
+        )
+
+    def handle(self, *args, **options):
+        tombstones = Tombstone.objects.all()[: options["limit"]]
+        for tombstone in tombstones:
+            self.stdout.write(f"{tombstone}:")
+            for stage, done, total in purge_tombstone(
+                tombstone, options["batch_size"], options["pause"]
+            ):
+                self.stdout.write(f"  {stage}: {done}/{total}")
+            self.stdout.write(self.style.SUCCESS(f"{tombstone}: удалено"))
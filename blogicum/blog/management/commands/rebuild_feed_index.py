@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from blog.feed_index import feed_index
+from blog.models import Category, Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Перестраивает индекс лент публикаций с нуля."
+
+    def handle(self, *args, **options):
+        feed_index.clear()
+        feeds = ["index"]
+        feeds += [
+            f"category:{pk}"
+            for pk in Category.objects.values_list("pk", flat=True)
+        ]
+        feeds += [
+            f"profile:{pk}"
+            for pk in Post.objects.values_list("author_id", flat=True)
+            .order_by()
+            .distinct()
+        ]
+        for feed in feeds:
+            _, ids = feed_index.build(feed)
+            self.stdout.write(f"{feed}: {len(ids)}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Перестроено лент: {len(feeds)}")
+        )
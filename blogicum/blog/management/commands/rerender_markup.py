@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from blog.backfills import BACKFILLS
+
+MARKUP_BACKFILLS = ("post_html", "comment_html")
+
+
+class Command(BaseCommand):
+    help = (
+        "Заново рендерит HTML публикаций и комментариев из Markdown, "
+        "например после обновления библиотеки или правил очистки."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=None,
+            help="Пауза между пачками в секундах.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Продолжить прерванный прогон, а не начинать заново.",
+        )
+
+    def handle(self, *args, **options):
+        for name in MARKUP_BACKFILLS:
+            backfill = BACKFILLS[name]
+            if not options["resume"]:
+                backfill.reset()
+            processed = changed = 0
+            for rows, updated in backfill.run(
+                batch_size=options["batch_size"], pause=options["pause"]
+            ):
+                processed += rows
+                changed += updated
+            self.stdout.write(
+                f"{name}: обработано {processed}, изменено {changed}"
+            )
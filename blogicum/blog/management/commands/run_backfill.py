@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.backfills import BACKFILLS
+
+
+class Command(BaseCommand):
+    help = (
+        "Выполняет зарегистрированную пакетную миграцию данных, "
+        "продолжая с последней контрольной точки."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", nargs="?")
+        parser.add_argument("--list", action="store_true")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=None,
+            help="Пауза между пачками в секундах.",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Начать заново, сбросив контрольную точку.",
+        )
+
+    def handle(self, *args, **options):
+        if options["list"] or not options["name"]:
+            for name in sorted(BACKFILLS):
+                self.stdout.write(name)
+            return
+        try:
+            backfill = BACKFILLS[options["name"]]
+        except KeyError:
+            raise CommandError(f"Неизвестная миграция {options['name']}")
+        if options["reset"]:
+            backfill.reset()
+        processed = changed = 0
+        for rows, updated in backfill.run(
+            batch_size=options["batch_size"], pause=options["pause"]
+        ):
+            processed += rows
+            changed += updated
+            self.stdout.write(
+                f"{backfill.name}: обработано {processed}, изменено {changed}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"{backfill.name}: готово"))
@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog import warmup
+
+
+class Command(BaseCommand):
+    help = (
+        "Прогревает кэши после запуска: рендерит первые страницы лент, "
+        "самые обсуждаемые публикации и статические страницы и выводит "
+        "время для каждого адреса."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=3,
+            help="Сколько первых страниц каждой ленты рендерить.",
+        )
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=20,
+            help="Сколько страниц публикаций рендерить.",
+        )
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=4,
+            help="Сколько адресов запрашивать одновременно.",
+        )
+        parser.add_argument(
+            "--host",
+            default=None,
+            help="Заголовок Host запросов; по умолчанию из ALLOWED_HOSTS.",
+        )
+
+    def handle(self, *args, **options):
+        host = options["host"] or next(
+            (
+                host.lstrip(".")
+                for host in settings.ALLOWED_HOSTS
+                if host != "*"
+            ),
+            "localhost",
+        )
+        started = time.perf_counter()
+        urls = warmup.routes(pages=options["pages"], posts=options["posts"])
+        results = warmup.warm(urls, jobs=options["jobs"], host=host)
+        for route, status, seconds in results:
+            line = f"{route:<60} {status:>4} {seconds * 1000:8.1f} мс"
+            if status >= 400:
+                line = self.style.WARNING(line)
+            self.stdout.write(line)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Прогрето адресов: {len(results)} за "
+                f"{time.perf_counter() - started:.2f} с"
+            )
+        )
@@ -0,0 +1,104 @@
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import markdown
+
+EXTENSIONS = ["nl2br", "sane_lists", "fenced_code"]
+
+ALLOWED_TAGS = set(
+    (
+        "a blockquote br code em h1 h2 h3 h4 h5 h6 hr img li ol p pre "
+        "strong ul"
+    ).split()
+)
+VOID_TAGS = {"br", "hr", "img"}
+# Содержимое этих тегов выбрасывается вместе с ними.
+DROPPED_TAGS = {"script", "style"}
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title"},
+    "ol": {"start"},
+}
+URL_ATTRIBUTES = {"href", "src"}
+SAFE_SCHEMES = {"", "http", "https", "mailto"}
+
+
+def is_safe_url(url):
+    try:
+        scheme = urlsplit(url.strip()).scheme.lower()
+    except ValueError:
+        return False
+    return scheme in SAFE_SCHEMES
+
+
+class Sanitizer(HTMLParser):
+    """Пересобирает HTML, оставляя только разрешённые теги и атрибуты.
+
+    Текст и значения атрибутов экранируются заново, незакрытые теги
+    закрываются в конце.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        rendered = "".join(
+            f' {name}="{escape(value, quote=True)}"'
+            for name, value in attrs
+            if name in allowed
+            and value is not None
+            and (name not in URL_ATTRIBUTES or is_safe_url(value))
+        )
+        self.parts.append(f"<{tag}{rendered}>")
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping or tag not in self.open_tags:
+            return
+        while self.open_tags:
+            opened = self.open_tags.pop()
+            self.parts.append(f"</{opened}>")
+            if opened == tag:
+                break
+
+    def handle_data(self, data):
+        if not self.dropping:
+            self.parts.append(escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return "".join(
+            self.parts + [f"</{tag}>" for tag in reversed(self.open_tags)]
+        )
+
+
+def sanitize(html):
+    sanitizer = Sanitizer()
+    sanitizer.feed(html)
+    return sanitizer.result()
+
+
+def render_markdown(text):
+    """HTML из Markdown, безопасный для вывода без экранирования.
+
+    Сырой HTML в тексте не пропускается, а выводится как текст;
+    результат дополнительно проходит через белый список тегов.
+    """
+    md = markdown.Markdown(extensions=EXTENSIONS, output_format="html")
+    md.preprocessors.deregister("html_block")
+    md.inlinePatterns.deregister("html")
+    return sanitize(md.convert(text))
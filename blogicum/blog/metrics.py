@@ -0,0 +1,43 @@
+import threading
+from collections import defaultdict
+
+
+class Metrics:
+    """Счётчики и сводки по времени внутри процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(int)
+        self.timings = {}
+
+    def incr(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+
+    def observe(self, name, seconds):
+        with self.lock:
+            summary = self.timings.setdefault(
+                name, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+            )
+            summary["count"] += 1
+            summary["total"] += seconds
+            summary["max"] = max(summary["max"], seconds)
+            summary["last"] = seconds
+
+    def snapshot(self):
+        with self.lock:
+            timings = {
+                name: dict(
+                    summary, avg=summary["total"] / summary["count"]
+                )
+                for name, summary in self.timings.items()
+            }
+            return {"counters": dict(self.counters), "timings": timings}
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.timings.clear()
+
+
+metrics = Metrics()
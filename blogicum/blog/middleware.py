@@ -0,0 +1,12 @@
+from .bus import bus
+
+
+class InvalidationBusMiddleware:
+    """Перед обработкой запроса применяет новые события сброса кэшей."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        bus.poll()
+        return self.get_response(request)
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:46
+
+from django.db import migrations
+
+import blog.fields
+
+BATCH_SIZE = 500
+
+
+def iter_batches(Post):
+    last_pk = 0
+    while True:
+        batch = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .only("pk", "text")[:BATCH_SIZE]
+        )
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+        yield batch
+
+
+def compress_existing(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    min_length = Post._meta.get_field("text").min_length
+    for batch in iter_batches(Post):
+        long_posts = [
+            post
+            for post in batch
+            if len(post.text.encode("utf-8")) >= min_length
+        ]
+        if long_posts:
+            Post.objects.bulk_update(long_posts, ["text"])
+
+
+def decompress_existing(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    connection = schema_editor.connection
+    sql = "UPDATE {} SET {} = %s WHERE {} = %s".format(
+        connection.ops.quote_name(Post._meta.db_table),
+        connection.ops.quote_name("text"),
+        connection.ops.quote_name("id"),
+    )
+    with connection.cursor() as cursor:
+        for batch in iter_batches(Post):
+            cursor.executemany(sql, [(post.text, post.pk) for post in batch])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_alter_comment_options_remove_comment_content"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="text",
+            field=blog.fields.CompressedTextField(verbose_name="Текст"),
+        ),
+        migrations.RunPython(compress_existing, decompress_existing),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("blog", "0006_compress_post_text"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="is_deleted",
+            field=models.BooleanField(
+                db_index=True,
+                default=False,
+                editable=False,
+                verbose_name="Удалено",
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="is_deleted",
+            field=models.BooleanField(
+                db_index=True,
+                default=False,
+                editable=False,
+                verbose_name="Удалено",
+            ),
+        ),
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Добавлено"
+                    ),
+                ),
+                (
+                    "post",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tombstone",
+                        to="blog.post",
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="blog_tombstone",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "отложенное удаление",
+                "verbose_name_plural": "Отложенные удаления",
+                "ordering": ["created_at"],
+            },
+        ),
+    ]
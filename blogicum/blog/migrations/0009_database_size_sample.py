@@ -0,0 +1,44 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_backfill_checkpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DatabaseSizeSample",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(max_length=256, verbose_name="Объект"),
+                ),
+                ("kind", models.CharField(max_length=16, verbose_name="Тип")),
+                ("size", models.BigIntegerField(verbose_name="Размер, байт")),
+                (
+                    "taken_at",
+                    models.DateTimeField(
+                        db_index=True, verbose_name="Измерено"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "размер объекта базы данных",
+                "verbose_name_plural": "Размеры объектов базы данных",
+                "ordering": ["-taken_at", "name"],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_database_size_sample"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InvalidationEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("topic", models.CharField(max_length=64)),
+                ("key", models.CharField(blank=True, max_length=256)),
+                ("origin", models.CharField(max_length=128)),
+                ("created_at", models.FloatField(db_index=True)),
+            ],
+            options={
+                "verbose_name": "событие сброса кэша",
+                "verbose_name_plural": "События сброса кэша",
+            },
+        ),
+    ]
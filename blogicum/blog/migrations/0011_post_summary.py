@@ -0,0 +1,32 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:32
+
+from django.db import migrations, models
+
+from blog.backfills import RunBackfill
+
+
+class Migration(migrations.Migration):
+    # Пачки бэкфилла фиксируются по отдельности.
+    atomic = False
+
+    dependencies = [
+        ("blog", "0010_invalidation_event"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Анонс"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="word_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Число слов"
+            ),
+        ),
+        RunBackfill("post_summary"),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:34
+
+from django.db import migrations
+
+import blog.fields
+from blog.backfills import RunBackfill
+
+
+class Migration(migrations.Migration):
+    # Пачки бэкфилла фиксируются по отдельности.
+    atomic = False
+
+    dependencies = [
+        ("blog", "0011_post_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="text_html",
+            field=blog.fields.RenderedHTMLField(
+                blank=True, editable=False, verbose_name="Текст в HTML"
+            ),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="text_html",
+            field=blog.fields.RenderedHTMLField(
+                blank=True, editable=False, verbose_name="Текст в HTML"
+            ),
+        ),
+        RunBackfill("post_html"),
+        RunBackfill("comment_html"),
+    ]
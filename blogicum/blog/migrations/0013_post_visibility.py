@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:38
+
+from django.db import migrations, models
+
+from blog.visibility import CATEGORY, LOCATION, POST, set_bit
+
+
+def fill_visibility(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Post.objects.update(visibility=0)
+    set_bit(Post.objects.filter(is_published=True), POST, True)
+    set_bit(Post.objects.filter(category__is_published=True), CATEGORY, True)
+    set_bit(Post.objects.filter(location__is_published=True), LOCATION, True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_markdown_html"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="visibility",
+            field=models.PositiveSmallIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                verbose_name="Видимость",
+            ),
+        ),
+        migrations.RunPython(fill_visibility, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,42 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from . import visibility
+from .fields import CompressedTextField, RenderedHTMLField
+from .markup import render_markdown
+from .query_cache import CachingManager
+from .summary import reading_time, summarize
+
 User = get_user_model()
 
 
+class NotDeletedManager(CachingManager):
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+class DerivedFromTextMixin:
+    """Пересчитывает ``derived_fields`` при каждой записи поля ``text``."""
+
+    derived_fields = ()
+
+    def derive_from_text(self):
+        """Заполняет ``derived_fields`` по ``text``; переопределяется."""
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if "text" not in self.get_deferred_fields() and (
+            update_fields is None or "text" in update_fields
+        ):
+            self.derive_from_text()
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    *self.derived_fields,
+                }
+        super().save(*args, **kwargs)
+
+
 class Location(models.Model):
     name = models.CharField(max_length=256, verbose_name="Название места")
     is_published = models.BooleanField(
@@ -15,6 +48,8 @@ class Location(models.Model):
         verbose_name="Добавлено", auto_now_add=True
     )
 
+    objects = CachingManager()
+
     class Meta:
         verbose_name = "местоположение"
         verbose_name_plural = "Местоположения"
@@ -43,6 +78,8 @@ class Category(models.Model):
         verbose_name="Добавлено", auto_now_add=True
     )
 
+    objects = CachingManager()
+
     class Meta:
         verbose_name = "категория"
         verbose_name_plural = "Категории"
@@ -51,9 +88,9 @@ class Category(models.Model):
         return self.title
 
 
-class Post(models.Model):
+class Post(DerivedFromTextMixin, models.Model):
     title = models.CharField(max_length=256, verbose_name="Заголовок")
-    text = models.TextField(verbose_name="Текст")
+    text = CompressedTextField(verbose_name="Текст")
     pub_date = models.DateTimeField(
         verbose_name="Дата и время публикации",
         help_text=(
@@ -86,6 +123,30 @@ class Post(models.Model):
         auto_now_add=True,
     )
     image = models.ImageField(upload_to="posts/", blank=True, null=True)
+    is_deleted = models.BooleanField(
+        verbose_name="Удалено",
+        default=False,
+        db_index=True,
+        editable=False,
+    )
+    # Считаются из текста при сохранении, чтобы лентам не читать его.
+    excerpt = models.TextField(
+        verbose_name="Анонс", blank=True, editable=False
+    )
+    word_count = models.PositiveIntegerField(
+        verbose_name="Число слов", default=0, editable=False
+    )
+    text_html = RenderedHTMLField(
+        verbose_name="Текст в HTML", blank=True, editable=False
+    )
+    # Биты из blog.visibility: опубликованы ли сама публикация, её
+    # категория и место. Обновляются при изменении любого из них.
+    visibility = models.PositiveSmallIntegerField(
+        verbose_name="Видимость", default=0, db_index=True, editable=False
+    )
+
+    objects = NotDeletedManager()
+    all_objects = CachingManager()
 
     class Meta:
         verbose_name = "публикация"
@@ -94,12 +155,42 @@ class Post(models.Model):
     def __str__(self):
         return self.title
 
+    derived_fields = ("excerpt", "word_count", "text_html")
+
+    @property
+    def reading_time(self):
+        return reading_time(self.word_count)
+
     @property
-    def comment_count(self):
-        return self.comments.count()
+    def shows_location(self):
+        return bool(self.visibility & visibility.LOCATION)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or visibility.SOURCE_FIELDS & set(
+            update_fields
+        ):
+            # Справочники берутся из снимков, а не из связей объекта: это
+            # не стоит запросов и не зависит от копий категории и места,
+            # сохранённых вместе с публикацией в кэше. Снимки читают эти
+            # модели, поэтому импортируются здесь.
+            from .snapshots import categories, locations
 
+            self.visibility = visibility.mask(
+                self.is_published,
+                categories.get(self.category_id),
+                locations.get(self.location_id),
+            )
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "visibility"}
+        super().save(*args, **kwargs)
 
-class Comment(models.Model):
+    def derive_from_text(self):
+        summarize(self)
+        self.text_html = render_markdown(self.text)
+
+
+class Comment(DerivedFromTextMixin, models.Model):
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
@@ -111,15 +202,106 @@ class Comment(models.Model):
         related_name="comments",
     )
     text = models.TextField(verbose_name="Текст комментария")
+    text_html = RenderedHTMLField(
+        verbose_name="Текст в HTML", blank=True, editable=False
+    )
     created_at = models.DateTimeField(
         verbose_name="Добавлено",
         auto_now_add=True,
     )
+    is_deleted = models.BooleanField(
+        verbose_name="Удалено",
+        default=False,
+        db_index=True,
+        editable=False,
+    )
+
+    objects = NotDeletedManager()
+    all_objects = CachingManager()
 
     class Meta:
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
         ordering = ["-created_at"]
 
+    derived_fields = ("text_html",)
+
     def __str__(self):
         return self.text
+
+    def derive_from_text(self):
+        self.text_html = render_markdown(self.text)
+
+
+class Tombstone(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="tombstone",
+    )
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="blog_tombstone",
+    )
+    created_at = models.DateTimeField(
+        verbose_name="Добавлено",
+        auto_now_add=True,
+    )
+
+    class Meta:
+        verbose_name = "отложенное удаление"
+        verbose_name_plural = "Отложенные удаления"
+        ordering = ["created_at"]
+
+    def __str__(self):
+        if self.post_id:
+            return f"Публикация #{self.post_id}"
+        return f"Пользователь #{self.user_id}"
+
+
+class BackfillCheckpoint(models.Model):
+    name = models.CharField(max_length=128, unique=True)
+    last_pk = models.BigIntegerField(default=0)
+    rows_done = models.BigIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "контрольная точка миграции данных"
+        verbose_name_plural = "Контрольные точки миграций данных"
+
+    def __str__(self):
+        return self.name
+
+
+class DatabaseSizeSample(models.Model):
+    name = models.CharField(max_length=256, verbose_name="Объект")
+    kind = models.CharField(max_length=16, verbose_name="Тип")
+    size = models.BigIntegerField(verbose_name="Размер, байт")
+    taken_at = models.DateTimeField(verbose_name="Измерено", db_index=True)
+
+    class Meta:
+        verbose_name = "размер объекта базы данных"
+        verbose_name_plural = "Размеры объектов базы данных"
+        ordering = ["-taken_at", "name"]
+
+    def __str__(self):
+        return f"{self.name}: {self.size}"
+
+
+class InvalidationEvent(models.Model):
+    topic = models.CharField(max_length=64)
+    key = models.CharField(max_length=256, blank=True)
+    origin = models.CharField(max_length=128)
+    created_at = models.FloatField(db_index=True)
+
+    class Meta:
+        verbose_name = "событие сброса кэша"
+        verbose_name_plural = "События сброса кэша"
+
+    def __str__(self):
+        return f"{self.topic}:{self.key}"
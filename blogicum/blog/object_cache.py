@@ -0,0 +1,158 @@
+import pickle
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import Http404
+
+from .bus import bus
+from .cache import TwoTierCache
+from .existence import surely_missing
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+MISSING = "__missing__"
+
+
+class ObjectCache:
+    """Сквозной кэш отдельных объектов по первичному ключу и алиасам.
+
+    По алиасу (``slug``, ``username``) хранится только первичный ключ,
+    сам объект лежит под ключом ``pk``. Отсутствие объекта тоже
+    кэшируется, но на ``negative_ttl`` секунд. Объекты хранятся
+    сериализованными, так что каждый вызов получает свою копию и может
+    её менять.
+    """
+
+    def __init__(self, tier, ttl=300, negative_ttl=30):
+        self.tier = tier
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.registry = {}
+
+    def register(self, model, aliases=(), queryset=None):
+        self.registry[model._meta.label_lower] = (
+            model,
+            tuple(aliases),
+            queryset or (lambda: model._default_manager.all()),
+        )
+
+    def is_registered(self, model):
+        return model._meta.label_lower in self.registry
+
+    def namespace(self, label):
+        return f"obj:{label}"
+
+    def fetch(self, model, field, value):
+        label = model._meta.label_lower
+        _, _, queryset = self.registry[label]
+        obj = queryset().filter(**{field: value}).first()
+        if obj is None:
+            self.tier.set(
+                self.namespace(label),
+                f"{field}:{value}",
+                MISSING,
+                self.negative_ttl,
+            )
+            return None
+        self.tier.set(
+            self.namespace(label), f"pk:{obj.pk}", pickle.dumps(obj), self.ttl
+        )
+        if field != "pk":
+            self.tier.set(
+                self.namespace(label), f"{field}:{value}", obj.pk, self.ttl
+            )
+        return obj
+
+    def get(self, model, field, value):
+        if field == "id":
+            field = "pk"
+        label = model._meta.label_lower
+        namespace = self.namespace(label)
+        cached = self.tier.get(namespace, f"{field}:{value}")
+        if cached == MISSING:
+            return None
+        if cached is None:
+            return self.fetch(model, field, value)
+        if field == "pk":
+            return pickle.loads(cached)
+        obj = self.get(model, "pk", cached)
+        if obj is None or getattr(obj, field) != value:
+            # Алиас устарел, например после переименования.
+            self.tier.delete(namespace, f"{field}:{value}")
+            return self.fetch(model, field, value)
+        return obj
+
+    def keys(self, model, pk, instance=None):
+        _, aliases, _ = self.registry[model._meta.label_lower]
+        keys = [f"pk:{pk}"]
+        if instance is not None:
+            keys += [
+                f"{alias}:{getattr(instance, alias)}" for alias in aliases
+            ]
+        return keys
+
+    def invalidate(self, model, pk, instance=None):
+        """Сбрасывает объект во всех процессах.
+
+        Пустой ``pk`` сбрасывает все объекты модели.
+        """
+        label = model._meta.label_lower
+        namespace = self.namespace(label)
+        if pk in ("", None):
+            self.tier.invalidate_on_commit(namespace)
+            bus.publish("object", f"{label}|*")
+            return
+        for key in self.keys(model, pk, instance):
+            self.tier.delete(namespace, key)
+            transaction.on_commit(
+                lambda key=key: self.tier.delete(namespace, key)
+            )
+            bus.publish("object", f"{label}|{key}")
+
+    def forget(self, event_key):
+        label, key = event_key.split("|", 1)
+        if key == "*":
+            self.tier.forget(self.namespace(label))
+        else:
+            self.tier.delete(self.namespace(label), key, local_only=True)
+
+
+def matches(obj, filters):
+    for name, value in filters.items():
+        field = obj._meta.get_field(name)
+        if field.is_relation:
+            if getattr(obj, field.attname) != getattr(value, "pk", value):
+                return False
+        elif getattr(obj, field.attname) != value:
+            return False
+    return True
+
+
+def get_cached_or_404(model, **lookup):
+    """Аналог ``get_object_or_404`` через кэш объектов.
+
+    Первый аргумент поиска — ключ кэша (``pk``, ``id`` или алиас модели),
+    остальные проверяются у найденного объекта. Заведомо отсутствующие
+    значения отсекаются фильтром существования без обращения к кэшу.
+    """
+    (field, value), *filters = lookup.items()
+    if surely_missing(model, "pk" if field == "id" else field, value):
+        raise Http404(f"{model._meta.object_name} not found.")
+    obj = object_cache.get(model, field, value)
+    if obj is None or not matches(obj, dict(filters)):
+        raise Http404(f"{model._meta.object_name} not found.")
+    return obj
+
+
+object_cache = ObjectCache(TwoTierCache(max_entries=5000))
+object_cache.register(Post)
+object_cache.register(Comment)
+object_cache.register(Category, aliases=["slug"])
+object_cache.register(Location)
+object_cache.register(
+    User,
+    aliases=["username"],
+    queryset=lambda: User.objects.filter(blog_tombstone__isnull=True),
+)
+bus.subscribe("object", object_cache.forget)
@@ -0,0 +1,118 @@
+import re
+
+from django.http import HttpResponse
+from django.template import RequestContext
+from django.template.loader import get_template
+
+from .cache import TwoTierCache
+
+# Пользовательский текст экранируется шаблонами, поэтому подделать
+# такой комментарий в теле страницы нельзя.
+HOLE_RE = re.compile(r"<!--hole:(\d+)-->")
+
+# Страницы дальше этой не кэшируются: перебор номеров не должен
+# вытеснять из общего кэша полезные записи.
+MAX_CACHED_PAGE = 100
+
+
+class HolePunch:
+    """Собирает «дырки» страницы при рендеринге общего тела.
+
+    Вместо содержимого тега ``{% hole %}`` в тело попадает метка,
+    а имя шаблона, его параметры и владелец запоминаются здесь.
+    """
+
+    def __init__(self):
+        self.holes = []
+
+    def punch(self, template_name, values, owner=None):
+        self.holes.append((template_name, values, owner))
+        return f"<!--hole:{len(self.holes) - 1}-->"
+
+
+def is_owner(user, owner):
+    return owner is None or (user.is_authenticated and user.pk == owner)
+
+
+def fill_holes(request, body, holes, extra=None):
+    """Рендерит дырки для текущего пользователя и вставляет их в тело.
+
+    Дырки с чужим владельцем не рендерятся вовсе, так что на странице с
+    сотней комментариев рендерятся только кнопки своих.
+    """
+    context = RequestContext(request, extra or {})
+    rendered = []
+    for template_name, values, owner in holes:
+        if not is_owner(request.user, owner):
+            rendered.append("")
+            continue
+        with context.push(values):
+            rendered.append(
+                get_template(template_name).template.render(context)
+            )
+    return HOLE_RE.sub(lambda match: rendered[int(match[1])], body)
+
+
+def page_number(request):
+    try:
+        return max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        return 1
+
+
+class HolePunchedMixin:
+    """Кэширует страницу целиком, кроме зависящих от пользователя дырок.
+
+    Тело страницы одно на всех посетителей и лежит в отдельном кэше
+    страниц. При каждом запросе заново рендерятся только маленькие
+    шаблоны дырок: шапка, кнопки владельца, форма с CSRF.
+    """
+
+    page_ttl = 60
+
+    def page_cache_key(self):
+        """Ключ из имени маршрута, его параметров и номера страницы.
+
+        Остальные параметры строки запроса страницу не меняют и в ключ
+        не входят. ``None`` отключает кэш для запроса.
+        """
+        number = page_number(self.request)
+        if number > MAX_CACHED_PAGE:
+            return None
+        kwargs = ",".join(
+            f"{name}={value}" for name, value in sorted(self.kwargs.items())
+        )
+        view_name = self.request.resolver_match.view_name
+        return f"{view_name}:{kwargs}:{number}"
+
+    def get_hole_context(self):
+        return {}
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["hole_punch"] = getattr(self, "hole_punch", None)
+        return context
+
+    def render_page(self, request, *args, **kwargs):
+        self.hole_punch = HolePunch()
+        response = super().get(request, *args, **kwargs)
+        response.render()
+        return response.content.decode(), self.hole_punch.holes
+
+    def get(self, request, *args, **kwargs):
+        key = self.page_cache_key()
+        if key is None:
+            body, holes = self.render_page(request, *args, **kwargs)
+        else:
+            body, holes = page_cache.get_or_compute(
+                "page",
+                key,
+                lambda: self.render_page(request, *args, **kwargs),
+                ttl=self.page_ttl,
+            )
+        return HttpResponse(
+            fill_holes(request, body, holes, self.get_hole_context())
+        )
+
+
+page_cache = TwoTierCache(max_entries=500)
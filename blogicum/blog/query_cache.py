@@ -0,0 +1,186 @@
+import hashlib
+import pickle
+import threading
+from contextlib import contextmanager
+
+from django.core.exceptions import EmptyResultSet
+from django.db import models
+
+from .cache import TwoTierCache
+from .timeouts import fingerprint, normalize_sql
+
+_state = threading.local()
+
+
+class QueryCache:
+    """Кэш результатов запросов ORM с версиями таблиц.
+
+    Ключ — SQL запроса с параметрами и номера версий всех таблиц из
+    ``FROM`` и ``JOIN``. Запись в таблицу увеличивает её версию, и все
+    запросы к ней перестают попадать в кэш. Таблицы из подзапросов не
+    учитываются, такие запросы кэшировать не стоит.
+    """
+
+    def __init__(self, tier, ttl=60):
+        self.tier = tier
+        self.ttl = ttl
+        self.listeners = []
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def on_invalidate(self, listener):
+        self.listeners.append(listener)
+
+    def namespace(self, table):
+        return f"table:{table}"
+
+    def invalidate(self, table, notify=True):
+        """Сбрасывает версию таблицы.
+
+        ``notify=False`` — когда другие процессы и так узнают об
+        изменении из шины событий.
+        """
+        self.tier.invalidate_on_commit(self.namespace(table))
+        if notify:
+            for listener in self.listeners:
+                listener(table)
+
+    def forget(self, table):
+        self.tier.forget(self.namespace(table))
+
+    def record(self, kind, sql, outcome):
+        key = (
+            fingerprint(sql)
+            if kind != "count"
+            else f"count:{fingerprint(sql)}"
+        )
+        with self.lock:
+            counter = self.counters.setdefault(
+                key, {"sql": normalize_sql(sql)[:300], "hit": 0, "miss": 0}
+            )
+            counter[outcome] += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                key: dict(counter) for key, counter in self.counters.items()
+            }
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+
+    def fetch(self, query, kind, using, compute, ttl=None):
+        try:
+            sql, params = query.sql_with_params()
+        except EmptyResultSet:
+            return compute()
+        tables = sorted(
+            {alias.table_name for alias in query.alias_map.values()}
+        )
+        versions = ",".join(
+            str(self.tier.version(self.namespace(table))) for table in tables
+        )
+        digest = hashlib.sha1(
+            f"{using}|{kind}|{sql}|{params!r}".encode()
+        ).hexdigest()
+        key = f"{digest}:{versions}"
+        cached = self.tier.get("query", key)
+        if cached is not None:
+            self.record(kind, sql, "hit")
+            return pickle.loads(cached)
+        self.record(kind, sql, "miss")
+        result = compute()
+        self.tier.set("query", key, pickle.dumps(result), ttl or self.ttl)
+        return result
+
+
+query_cache = QueryCache(TwoTierCache(max_entries=2000))
+
+
+@contextmanager
+def cache_queries(ttl=None):
+    """Включает кэш запросов для всех ``CachingQuerySet`` внутри блока.
+
+    Работает и как декоратор представления.
+    """
+    previous = getattr(_state, "ttl", None)
+    _state.ttl = ttl or query_cache.ttl
+    try:
+        yield
+    finally:
+        _state.ttl = previous
+
+
+class CachingQuerySet(models.QuerySet):
+    """QuerySet с кэшем результатов по запросу: ``.cached(ttl)``.
+
+    Массовые ``update`` и ``delete`` сбрасывают версию таблицы модели.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cache_ttl = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._cache_ttl = self._cache_ttl
+        return clone
+
+    def cached(self, ttl=None):
+        clone = self._chain()
+        clone._cache_ttl = ttl or query_cache.ttl
+        return clone
+
+    def cache_ttl(self):
+        return self._cache_ttl or getattr(_state, "ttl", None)
+
+    def _fetch_all(self):
+        ttl = self.cache_ttl()
+        if self._result_cache is None and ttl:
+            self._result_cache = query_cache.fetch(
+                self.query,
+                self._iterable_class.__name__,
+                self.db,
+                lambda: list(self._iterable_class(self)),
+                ttl,
+            )
+        super()._fetch_all()
+
+    def count(self):
+        ttl = self.cache_ttl()
+        if self._result_cache is not None or not ttl:
+            return super().count()
+        return query_cache.fetch(
+            self.query, "count", self.db, super().count, ttl
+        )
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        query_cache.invalidate(self.model._meta.db_table)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        result = super().delete()
+        query_cache.invalidate(self.model._meta.db_table)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def bulk_create(self, *args, **kwargs):
+        objs = super().bulk_create(*args, **kwargs)
+        query_cache.invalidate(self.model._meta.db_table)
+        return objs
+
+    def bulk_update(self, *args, **kwargs):
+        rows = super().bulk_update(*args, **kwargs)
+        query_cache.invalidate(self.model._meta.db_table)
+        return rows
+
+    bulk_update.alters_data = True
+
+
+CachingManager = models.Manager.from_queryset(CachingQuerySet)
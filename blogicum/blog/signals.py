@@ -0,0 +1,161 @@
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from . import visibility
+from .bus import bus
+from .cache import feed_cache
+from .existence import note_saved
+from .feed_index import feed_index
+from .models import Category, Comment, Location, Post
+from .object_cache import object_cache
+from .page_cache import page_cache
+from .query_cache import query_cache
+from .snapshots import SNAPSHOTS
+
+User = get_user_model()
+
+FEED_TOPICS = ("blog.post", "blog.comment", "blog.category", "blog.location")
+# Страницы показывают ещё и данные пользователей.
+PAGE_TOPICS = FEED_TOPICS + (User._meta.label_lower,)
+
+_muted = threading.local()
+
+
+@contextmanager
+def muted():
+    """Отключает обработчики изменений моделей в текущем потоке.
+
+    Для массовых операций, которые сами вызывают ``publish_change`` один
+    раз на всю операцию.
+    """
+    previous = getattr(_muted, "active", False)
+    _muted.active = True
+    try:
+        yield
+    finally:
+        _muted.active = previous
+
+
+def is_muted():
+    return getattr(_muted, "active", False)
+
+
+def publish_change(model, pk, instance=None):
+    query_cache.invalidate(model._meta.db_table, notify=False)
+    if model._meta.label_lower in FEED_TOPICS:
+        feed_cache.invalidate_on_commit("feed")
+    if model._meta.label_lower in PAGE_TOPICS:
+        page_cache.invalidate_on_commit("page")
+    if model is Post:
+        feed_index.post_changed(pk, instance)
+    elif model is Category:
+        # Видимость категории влияет на ленту главной страницы.
+        feed_index.drop("index")
+    if model._meta.label_lower in SNAPSHOTS:
+        SNAPSHOTS[model._meta.label_lower].invalidate()
+    if object_cache.is_registered(model):
+        object_cache.invalidate(model, pk, instance)
+    bus.publish(model._meta.label_lower, pk)
+
+
+@receiver(pre_save, sender=Post)
+def remember_feeds(sender, instance, **kwargs):
+    if instance.pk is not None and not is_muted():
+        instance._previous_feeds = feed_index.previous_feeds(instance.pk)
+
+
+# Бит видимости публикаций, который зависит от справочника.
+VISIBILITY_BITS = {
+    Category: ("category_id", visibility.CATEGORY),
+    Location: ("location_id", visibility.LOCATION),
+}
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+def remember_published(sender, instance, **kwargs):
+    instance._was_published = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("is_published", flat=True)
+        .first()
+        if instance.pk is not None
+        else None
+    )
+
+
+def set_visibility(sender, pk, value):
+    field, bit = VISIBILITY_BITS[sender]
+    visibility.set_bit(Post.all_objects.filter(**{field: pk}), bit, value)
+    # Публикации в кэше объектов хранятся вместе с маской.
+    object_cache.invalidate(Post, "")
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+def published_changed(sender, instance, created, **kwargs):
+    was_published = getattr(instance, "_was_published", None)
+    if not created and was_published != instance.is_published:
+        set_visibility(sender, instance.pk, instance.is_published)
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+def reference_deleted(sender, instance, **kwargs):
+    # Связь обнулится без сохранения публикаций, бит снимаем заранее.
+    set_visibility(sender, instance.pk, False)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def model_changed(sender, instance, **kwargs):
+    if is_muted():
+        return
+    if kwargs.get("update_fields") == frozenset(["last_login"]):
+        # Вход пользователя ничего не меняет на страницах.
+        query_cache.invalidate(sender._meta.db_table)
+        return
+    publish_change(sender, instance.pk, instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=User)
+def existence_changed(sender, instance, created, update_fields, **kwargs):
+    if is_muted():
+        return
+    note_saved(sender, instance, created, update_fields)
+
+
+for topic in FEED_TOPICS:
+    bus.subscribe(topic, lambda key: feed_cache.forget("feed"))
+for topic in PAGE_TOPICS:
+    bus.subscribe(topic, lambda key: page_cache.forget("page"))
+for topic, snapshot in SNAPSHOTS.items():
+    bus.subscribe(topic, snapshot.forget)
+bus.on_gap(feed_cache.clear)
+bus.on_gap(page_cache.clear)
+query_cache.on_invalidate(lambda table: bus.publish("table", table))
+bus.subscribe("table", query_cache.forget)
+for model in (Post, Comment, Category, Location, User):
+    bus.subscribe(
+        model._meta.label_lower,
+        lambda key, table=model._meta.db_table: query_cache.forget(table),
+    )
+bus.on_gap(query_cache.tier.clear)
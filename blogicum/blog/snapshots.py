@@ -0,0 +1,68 @@
+import threading
+from collections import namedtuple
+
+from .cache import feed_cache
+from .models import Category, Location
+
+CategoryRecord = namedtuple(
+    "CategoryRecord", ["id", "title", "slug", "is_published"]
+)
+LocationRecord = namedtuple("LocationRecord", ["id", "name", "is_published"])
+
+
+class Snapshot:
+    """Копия небольшой справочной таблицы в памяти процесса.
+
+    Таблица перечитывается целиком, только когда меняется её номер версии
+    в общем кэше; о смене версии процесс узнаёт из шины событий.
+    """
+
+    def __init__(self, model, record, tier):
+        self.model = model
+        self.record = record
+        self.tier = tier
+        self.namespace = f"snapshot:{model._meta.label_lower}"
+        self.version = None
+        self.records = {}
+        self.published = frozenset()
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        version = self.tier.version(self.namespace)
+        if version == self.version:
+            return self
+        with self.lock:
+            if version != self.version:
+                rows = self.model._default_manager.values_list(
+                    *self.record._fields
+                )
+                records = {row[0]: self.record._make(row) for row in rows}
+                self.records = records
+                self.published = frozenset(
+                    pk for pk, record in records.items() if record.is_published
+                )
+                self.version = version
+        return self
+
+    def get(self, pk):
+        if pk is None:
+            return None
+        return self.refresh().records.get(pk)
+
+    def published_ids(self):
+        return self.refresh().published
+
+    def invalidate(self):
+        self.tier.invalidate_on_commit(self.namespace)
+
+    def forget(self, key=None):
+        self.tier.forget(self.namespace)
+
+
+categories = Snapshot(Category, CategoryRecord, feed_cache)
+locations = Snapshot(Location, LocationRecord, feed_cache)
+
+SNAPSHOTS = {
+    "blog.category": categories,
+    "blog.location": locations,
+}
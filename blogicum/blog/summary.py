@@ -0,0 +1,29 @@
+import math
+import re
+
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 10
+WORDS_PER_MINUTE = 200
+
+WORD_RE = re.compile(r"\S+")
+
+
+def make_excerpt(text):
+    # То же, что фильтр ``truncatewords:10``, которым анонс строился раньше.
+    return Truncator(text).words(EXCERPT_WORDS, truncate=" …")
+
+
+def count_words(text):
+    return sum(1 for _ in WORD_RE.finditer(text))
+
+
+def reading_time(word_count):
+    """Время чтения в минутах, не меньше одной."""
+    return max(math.ceil(word_count / WORDS_PER_MINUTE), 1)
+
+
+def summarize(post):
+    """Заполняет анонс и число слов публикации по её тексту."""
+    post.excerpt = make_excerpt(post.text)
+    post.word_count = count_words(post.text)
@@ -0,0 +1,79 @@
+from django import template
+from django.template.base import TemplateSyntaxError, token_kwargs
+
+from blog import snapshots
+from blog.cards import render_post_card
+from blog.form_cache import render_cached_form
+from blog.page_cache import is_owner
+from blog.urlbuilder import blog_urls
+
+register = template.Library()
+
+
+@register.filter
+def category_of(post):
+    return snapshots.categories.get(post.category_id)
+
+
+@register.filter
+def location_of(post):
+    return snapshots.locations.get(post.location_id)
+
+
+@register.simple_tag
+def blog_url(name, *args, **kwargs):
+    """``{% url "blog:<name>" ... %}`` без обхода резолвера."""
+    return blog_urls.url(name, *args, **kwargs)
+
+
+@register.simple_tag
+def post_card(post):
+    """То же, что ``{% include "includes/post_card.html" %}``, но быстрее."""
+    return render_post_card(post)
+
+
+@register.simple_tag
+def cached_form(form, **options):
+    """``{% bootstrap_form %}`` с кэшем разметки пустых форм."""
+    return render_cached_form(form, **options)
+
+
+class HoleNode(template.Node):
+    def __init__(self, template_name, extra):
+        self.template_name = template_name
+        self.extra = extra
+
+    def render(self, context):
+        template_name = self.template_name.resolve(context)
+        values = {
+            name: value.resolve(context) for name, value in self.extra.items()
+        }
+        owner = values.pop("owner", None)
+        hole_punch = context.get("hole_punch")
+        if hole_punch is not None:
+            return hole_punch.punch(template_name, values, owner)
+        if not is_owner(context.get("user"), owner):
+            return ""
+        included = context.template.engine.get_template(template_name)
+        with context.push(values):
+            return included.render(context)
+
+
+@register.tag
+def hole(parser, token):
+    """Включает шаблон, зависящий от пользователя.
+
+    Использование: ``{% hole "includes/header.html" post_id=post.id %}``.
+    Параметры должны быть простыми значениями: при кэшировании страницы
+    они хранятся вместе с ней. С параметром ``owner`` шаблон рендерится
+    только для пользователя с этим id.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise TemplateSyntaxError(f"{bits[0]} требует имя шаблона.")
+    extra = token_kwargs(bits[2:], parser)
+    if len(extra) != len(bits) - 2:
+        raise TemplateSyntaxError(
+            f"{bits[0]} принимает только именованные параметры."
+        )
+    return HoleNode(parser.compile_filter(bits[1]), extra)
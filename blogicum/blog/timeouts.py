@@ -0,0 +1,109 @@
+import hashlib
+import logging
+import re
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.shortcuts import render
+
+logger = logging.getLogger(__name__)
+
+# Через сколько инструкций виртуальной машины SQLite проверять время.
+PROGRESS_STEPS = 10000
+
+IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+class QueryTimeout(OperationalError):
+    def __init__(self, sql, seconds):
+        self.sql = sql
+        self.seconds = seconds
+        self.fingerprint = fingerprint(sql)
+        super().__init__(
+            f"Запрос {self.fingerprint} прерван: превышен лимит {seconds} с"
+        )
+
+
+def normalize_sql(sql):
+    return LITERAL_RE.sub("?", IN_LIST_RE.sub("IN (...)", sql))
+
+
+def fingerprint(sql):
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:12]
+
+
+def is_interrupt(error):
+    return "interrupted" in str(error)
+
+
+@contextmanager
+def query_time_limit(seconds, using="default"):
+    """Прерывает каждый запрос к SQLite, выполняющийся дольше ``seconds``.
+
+    Лимит отсчитывается заново для каждого запроса и включает выборку
+    строк. Прерванный запрос поднимает ``QueryTimeout`` и пишется в лог
+    вместе с отпечатком SQL. Для других СУБД ничего не делает.
+    """
+    connection = connections[using]
+    if not seconds or connection.vendor != "sqlite":
+        yield
+        return
+    state = {"deadline": None, "sql": ""}
+
+    def progress():
+        deadline = state["deadline"]
+        return deadline is not None and time.monotonic() > deadline
+
+    def start_timer(execute, sql, params, many, context):
+        state["deadline"] = time.monotonic() + seconds
+        state["sql"] = sql
+        return execute(sql, params, many, context)
+
+    connection.ensure_connection()
+    raw = connection.connection
+    raw.set_progress_handler(progress, PROGRESS_STEPS)
+    try:
+        with connection.execute_wrapper(start_timer):
+            yield
+    except OperationalError as error:
+        if not is_interrupt(error) or isinstance(error, QueryTimeout):
+            raise
+        timeout = QueryTimeout(state["sql"], seconds)
+        logger.warning(
+            "%s: %s", timeout, normalize_sql(state["sql"])[:500]
+        )
+        raise timeout from error
+    finally:
+        raw.set_progress_handler(None, PROGRESS_STEPS)
+
+
+def query_budget(seconds=None, template_name="pages/503.html"):
+    """Ограничивает время запросов представления.
+
+    Если запрос прерван, вместо зависшего воркера пользователь получает
+    лёгкую страницу «попробуйте позже» со статусом 503.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            limit = seconds or settings.QUERY_TIME_LIMIT
+            try:
+                with query_time_limit(limit):
+                    response = view(request, *args, **kwargs)
+                    # Шаблонные ответы выполняют ленивые запросы при
+                    # рендеринге, поэтому рендерим их внутри лимита.
+                    if hasattr(response, "render"):
+                        response.render()
+            except QueryTimeout:
+                response = render(request, template_name, status=503)
+                response["Retry-After"] = "5"
+            return response
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,104 @@
+import re
+import threading
+
+from django.urls import (
+    NoReverseMatch,
+    get_resolver,
+    get_script_prefix,
+    get_urlconf,
+)
+from django.urls.resolvers import get_ns_resolver
+from django.utils.encoding import iri_to_uri
+from django.utils.http import RFC3986_SUBDELIMS, escape_leading_slashes, quote
+
+SAFE = RFC3986_SUBDELIMS + "/~:@"
+
+
+class URLBuilder:
+    """Быстрая замена ``reverse()`` для маршрутов одного пространства имён.
+
+    Для каждого имени маршрута один раз запоминаются строка формата,
+    регулярное выражение и конвертеры из того же ``reverse_dict``, по
+    которому работает ``reverse()``; при вызове остаётся подставить
+    аргументы и префикс скрипта. Результат совпадает с ``reverse()``,
+    в том числе при префиксе скрипта. Маршруты с ``i18n_patterns`` не
+    поддерживаются.
+    """
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.compiled = (None, {})
+        self.lock = threading.Lock()
+
+    def compile(self, resolver):
+        extra, ns_resolver = resolver.namespace_dict[self.namespace]
+        if extra:
+            ns_resolver = get_ns_resolver(extra, ns_resolver, ())
+        routes = {}
+        for name in ns_resolver.reverse_dict:
+            if not isinstance(name, str):
+                continue
+            routes[name] = [
+                (
+                    result,
+                    params,
+                    re.compile(f"^{pattern}"),
+                    converters,
+                    defaults,
+                )
+                for possibility, pattern, defaults, converters in (
+                    ns_resolver.reverse_dict.getlist(name)
+                )
+                for result, params in possibility
+            ]
+        return resolver, routes
+
+    def routes(self):
+        resolver = get_resolver(get_urlconf())
+        compiled_for, routes = self.compiled
+        if compiled_for is not resolver:
+            with self.lock:
+                self.compiled = self.compile(resolver)
+            routes = self.compiled[1]
+        return routes
+
+    def url(self, name, *args, **kwargs):
+        for result, params, regex, converters, defaults in self.routes().get(
+            name, ()
+        ):
+            if args:
+                if len(args) != len(params):
+                    continue
+                values = dict(zip(params, args))
+            else:
+                if (
+                    set(kwargs)
+                    .symmetric_difference(params)
+                    .difference(defaults)
+                ):
+                    continue
+                if any(kwargs.get(k, v) != v for k, v in defaults.items()):
+                    continue
+                values = kwargs
+            try:
+                text = {
+                    key: (
+                        converters[key].to_url(value)
+                        if key in converters
+                        else str(value)
+                    )
+                    for key, value in values.items()
+                }
+            except ValueError:
+                continue
+            path = result % text
+            if regex.search(path):
+                url = quote(get_script_prefix() + path, safe=SAFE)
+                return iri_to_uri(escape_leading_slashes(url))
+        raise NoReverseMatch(
+            f"Reverse for '{self.namespace}:{name}' with arguments "
+            f"{args or kwargs} not found."
+        )
+
+
+blog_urls = URLBuilder("blog")
@@ -36,4 +36,10 @@ urlpatterns = [
         views.delete_comment,
         name="delete_comment",
     ),
+    path("metrics/", views.metrics_view, name="metrics"),
+    path(
+        "locations/autocomplete/",
+        views.location_autocomplete,
+        name="location_autocomplete",
+    ),
 ]
@@ -1,15 +1,41 @@
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Count
+from django.conf import settings
+from django.core.paginator import Paginator, Page, EmptyPage, PageNotAnInteger
+from django.db.models import Count, Q
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import get_template
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.utils.decorators import method_decorator
 from django.utils.timezone import now
 from django.views.generic import ListView, DetailView
-from django.http import HttpResponseForbidden
-
+from django.http import (
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+
+from . import visibility
+from .autocomplete import location_index
 from .models import Post, Comment, Category
 from .forms import PostForm, CommentForm, UserForm
+from .cache import feed_cache
+from .deletion import tombstone_post
+from .feed_index import feed_index
+from .feed_rows import feed_rows
+from .jinja import TemplateEngineMixin
+from .metrics import metrics
+from .object_cache import get_cached_or_404, object_cache
+from .page_cache import HolePunch, HolePunchedMixin, fill_holes
+from .query_cache import query_cache
+from .snapshots import categories
+from .timeouts import QueryTimeout, query_budget, query_time_limit
+
+# Метка на месте списка комментариев при потоковой отдаче страницы.
+COMMENTS_MARKER = "<!--stream:comments-->"
+
+COMMENT_COUNT = Count("comments", filter=Q(comments__is_deleted=False))
 
 
 def paginate_queryset(request, queryset, per_page=10):
@@ -24,78 +50,250 @@ def paginate_queryset(request, queryset, per_page=10):
     return page_obj
 
 
-class IndexView(ListView):
+def cached_page(request, queryset, key, per_page=10, feed=None):
+    """Страница ленты из кэша.
+
+    Если указана лента ``feed``, id публикаций страницы берутся из
+    индекса лент, а из базы выбираются только они. С настройкой
+    ``BLOG_FEED_ROWS`` на странице лёгкие ``FeedRow`` вместо объектов
+    модели.
+    """
+    try:
+        number = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        number = 1
+    load = feed_rows if settings.BLOG_FEED_ROWS else list
+
+    def compute():
+        if feed is None:
+            page = paginate_queryset(request, queryset, per_page)
+            return page.number, load(page.object_list), page.paginator.count
+        ids, page_number, count = feed_index.page(feed, number, per_page)
+        # Фильтры запроса остаются страховкой от устаревшего индекса.
+        posts = {post.pk: post for post in load(queryset.filter(pk__in=ids))}
+        return page_number, [posts[pk] for pk in ids if pk in posts], count
+
+    if load is feed_rows:
+        key = f"{key}:rows"
+    number, object_list, count = feed_cache.get_or_compute(
+        "feed", f"{key}:{number}", compute
+    )
+    paginator = Paginator(queryset, per_page)
+    paginator.count = count
+    return Page(object_list, number, paginator)
+
+
+def attach_related(post):
+    # Категория и место берутся шаблонами из снимков справочников.
+    author = object_cache.get(User, "pk", post.author_id)
+    if author:
+        post.author = author
+    return post
+
+
+@method_decorator(query_budget(), name="dispatch")
+class IndexView(TemplateEngineMixin, HolePunchedMixin, ListView):
     model = Post
     template_name = "blog/index.html"
     context_object_name = "page_obj"
 
     def get_queryset(self):
         return Post.objects.filter(
-            is_published=True,
-            category__is_published=True,
+            visibility__in=visibility.LISTED_MASKS,
             pub_date__lte=now(),
-        ).annotate(comment_count=Count('comments')).order_by("-pub_date")
+        ).select_related("author").defer("text", "text_html").annotate(
+            comment_count=COMMENT_COUNT
+        ).order_by("-pub_date")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         full_qs = self.get_queryset()
-        context["page_obj"] = paginate_queryset(self.request, full_qs, per_page=10)
+        context["page_obj"] = cached_page(
+            self.request, full_qs, "index", feed="index"
+        )
         return context
 
 
-class CategoryPostsView(ListView):
+@method_decorator(query_budget(), name="dispatch")
+class CategoryPostsView(TemplateEngineMixin, HolePunchedMixin, ListView):
     model = Post
     template_name = "blog/category.html"
     context_object_name = "page_obj"
 
     def get_queryset(self):
         category_slug = self.kwargs.get("category_slug")
-        category = get_object_or_404(Category, slug=category_slug, is_published=True)
+        category = get_cached_or_404(
+            Category, slug=category_slug, is_published=True
+        )
         return Post.objects.filter(
             category=category,
             pub_date__lte=now(),
-            is_published=True,
-        ).annotate(comment_count=Count('comments')).order_by("-pub_date")
+            visibility__in=visibility.LISTED_MASKS,
+        ).select_related("author").defer("text", "text_html").annotate(
+            comment_count=COMMENT_COUNT
+        ).order_by("-pub_date")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["category"] = get_object_or_404(Category, slug=self.kwargs.get("category_slug"))
+        context["category"] = get_cached_or_404(
+            Category, slug=self.kwargs.get("category_slug")
+        )
         full_qs = self.get_queryset()
-        context["page_obj"] = paginate_queryset(self.request, full_qs, per_page=10)
+        feed = f"category:{context['category'].pk}"
+        context["page_obj"] = cached_page(
+            self.request, full_qs, feed, feed=feed
+        )
         return context
 
 
-class AuthorPostsView(ListView):
+@method_decorator(query_budget(), name="dispatch")
+class AuthorPostsView(TemplateEngineMixin, HolePunchedMixin, ListView):
     model = Post
     template_name = "blog/profile.html"
     context_object_name = "page_obj"
 
+    def page_cache_key(self):
+        # Владельцу видны и неопубликованные записи.
+        is_owner = self.request.user.username == self.kwargs["username"]
+        key = super().page_cache_key()
+        return key and f"{key}:{int(is_owner)}"
+
     def get_queryset(self):
         username = self.kwargs.get("username")
-        author = get_object_or_404(User, username=username)
+        author = get_cached_or_404(User, username=username)
         base_qs = Post.objects.filter(author=author)
         if self.request.user != author:
             base_qs = base_qs.filter(is_published=True, pub_date__lte=now())
-        return base_qs.annotate(comment_count=Count('comments')).order_by("-pub_date")
+        return (
+            base_qs.select_related("author")
+            .defer("text", "text_html")
+            .annotate(comment_count=COMMENT_COUNT)
+            .order_by("-pub_date")
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["profile"] = get_object_or_404(User, username=self.kwargs.get("username"))
+        context["profile"] = get_cached_or_404(
+            User, username=self.kwargs.get("username")
+        )
         full_qs = self.get_queryset()
-        context["page_obj"] = paginate_queryset(self.request, full_qs, per_page=10)
+        is_owner = self.request.user == context["profile"]
+        # Владелец видит и скрытые публикации, их в индексе лент нет.
+        context["page_obj"] = cached_page(
+            self.request,
+            full_qs,
+            f"profile:{context['profile'].pk}:{int(is_owner)}",
+            feed=None if is_owner else f"profile:{context['profile'].pk}",
+        )
         return context
 
 
-class PostDetailView(DetailView):
+@method_decorator(query_budget(), name="dispatch")
+class PostDetailView(TemplateEngineMixin, HolePunchedMixin, DetailView):
     model = Post
     template_name = "blog/detail.html"
     context_object_name = "post"
 
+    # Комментарии длинных обсуждений отдаются потоком по столько штук.
+    stream_chunk_size = 50
+    streaming = False
+
+    def page_cache_key(self):
+        # Проверяем, что публикация видна посетителю, до чтения кэша.
+        self.get_object()
+        key = super().page_cache_key()
+        if key and self.streaming:
+            key = f"{key}:stream"
+        return key
+
+    def get_hole_context(self):
+        return {"form": CommentForm()}
+
+    def get_comments(self):
+        return self.object.comments.select_related("author").order_by(
+            "created_at", "pk"
+        )
+
+    def get_comment_chunk(self, after=None):
+        """Следующая пачка комментариев после комментария ``after``.
+
+        Каждая пачка выбирается отдельным запросом, а не курсором на всё
+        обсуждение, так что лимит времени действует на каждую из них.
+        """
+        comments = self.get_comments()
+        if after is not None:
+            comments = comments.filter(
+                Q(created_at__gt=after.created_at)
+                | Q(created_at=after.created_at, pk__gt=after.pk)
+            )
+        return list(comments[: self.stream_chunk_size])
+
+    def get(self, request, *args, **kwargs):
+        """Страница публикации; длинные обсуждения отдаются потоком.
+
+        Если комментариев больше ``BLOG_STREAM_COMMENTS``, страница
+        рендерится с меткой вместо списка комментариев. Всё до метки
+        уходит клиенту сразу, затем комментарии выбираются и рендерятся
+        пачками, так что в памяти одновременно только одна пачка.
+        """
+        self.object = self.get_object()
+        self.streaming = (
+            self.get_comments().cached().count()
+            > settings.BLOG_STREAM_COMMENTS
+        )
+        response = super().get(request, *args, **kwargs)
+        if not self.streaming:
+            return response
+        head, marker, tail = response.content.decode().partition(
+            COMMENTS_MARKER
+        )
+        if not marker:
+            return response
+        # Первая пачка выбирается ещё внутри лимита представления: если
+        # запрос прерван, посетитель получит страницу 503.
+        chunk = self.get_comment_chunk()
+        return StreamingHttpResponse(self.stream_comments(head, chunk, tail))
+
+    def render_comment_chunk(self, template, chunk):
+        hole_punch = HolePunch()
+        body = template.render(
+            {"comments": chunk, "post": self.object, "hole_punch": hole_punch},
+            self.request,
+        )
+        return fill_holes(
+            self.request, body, hole_punch.holes, self.get_hole_context()
+        )
+
+    def stream_comments(self, head, chunk, tail):
+        # Генератор работает уже после выхода из dispatch, поэтому лимит
+        # времени запросов включается здесь заново для каждой пачки.
+        yield head
+        template = get_template(
+            "includes/comment_list.html", using=self.template_engine
+        )
+        limit = settings.QUERY_TIME_LIMIT
+        try:
+            while chunk:
+                with query_time_limit(limit):
+                    body = self.render_comment_chunk(template, chunk)
+                yield body
+                if len(chunk) < self.stream_chunk_size:
+                    break
+                with query_time_limit(limit):
+                    chunk = self.get_comment_chunk(after=chunk[-1])
+        except QueryTimeout:
+            # Начало страницы уже отправлено, и ответить 503 нельзя:
+            # обсуждение обрывается, а страница закрывается как обычно.
+            pass
+        yield tail
+
     def get_object(self):
-        post = get_object_or_404(Post, pk=self.kwargs["pk"])
+        post = attach_related(get_cached_or_404(Post, pk=self.kwargs["pk"]))
+        category = categories.get(post.category_id)
         if (
             not post.is_published
-            or not post.category.is_published
+            or category is None
+            or not category.is_published
             or post.pub_date > now()
         ) and post.author != self.request.user:
             raise Http404("Post not found.")
@@ -104,7 +302,10 @@ class PostDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["form"] = CommentForm()
-        context["comments"] = self.object.comments.select_related("author").order_by("created_at")
+        if self.streaming:
+            context["stream_comments"] = True
+        else:
+            context["comments"] = self.get_comments().cached()
         return context
 
 
@@ -122,10 +323,13 @@ def create_post(request):
     return render(request, "blog/create.html", {"form": form})
 
 
+# Изменяющие представления читают объекты из базы, а не из кэша
+# объектов: ``ModelForm.save()`` пишет все столбцы, и устаревшая копия
+# откатила бы чужие изменения.
 @login_required
 def edit_post(request, post_id):
     post = get_object_or_404(Post, id=post_id)
-    if post.author != request.user:
+    if post.author_id != request.user.pk:
         return redirect("blog:post_detail", pk=post_id)
     if request.method == "POST":
         form = PostForm(request.POST, request.FILES, instance=post)
@@ -139,9 +343,11 @@ def edit_post(request, post_id):
 
 @login_required
 def delete_post(request, post_id):
-    post = get_object_or_404(Post, id=post_id, author=request.user)
+    post = attach_related(
+        get_object_or_404(Post, id=post_id, author=request.user)
+    )
     if request.method == "POST":
-        post.delete()
+        tombstone_post(post)
         return redirect("blog:profile", username=request.user.username)
     return render(request, "blog/detail.html", {"post": post, "is_delete": True})
 
@@ -163,7 +369,9 @@ def add_comment(request, post_id):
 
 @login_required
 def edit_comment(request, post_id, comment_id):
-    comment = get_object_or_404(Comment, id=comment_id, post_id=post_id, author=request.user)
+    comment = get_object_or_404(
+        Comment, id=comment_id, post_id=post_id, author=request.user
+    )
     if request.method == "POST":
         form = CommentForm(request.POST, instance=comment)
         if form.is_valid():
@@ -176,7 +384,9 @@ def edit_comment(request, post_id, comment_id):
 
 @login_required
 def delete_comment(request, post_id, comment_id):
-    comment = get_object_or_404(Comment, id=comment_id, post_id=post_id, author=request.user)
+    comment = get_object_or_404(
+        Comment, id=comment_id, post_id=post_id, author=request.user
+    )
     if comment.author != request.user:
         return HttpResponseForbidden("Неовзожно удалить комментарий, автором которого вы не являетесь!.")
     if request.method == "POST":
@@ -185,7 +395,7 @@ def delete_comment(request, post_id, comment_id):
     return render(request, "blog/comment.html", {"comment": comment})
 
 def user_profile(request, username):
-    user = get_object_or_404(User, username=username)
+    user = get_cached_or_404(User, username=username)
     return render(request, "blog/profile.html", {"profile": user})
 
 
@@ -198,4 +408,18 @@ def edit_profile(request):
             return redirect("blog:profile", username=form.cleaned_data["username"])
     else:
         form = UserForm(instance=request.user)
-    return render(request, "blog/user.html", {"form": form, "profile": request.user})
\ No newline at end of file
+    return render(request, "blog/user.html", {"form": form, "profile": request.user})
+
+
+@staff_member_required
+def metrics_view(request):
+    return JsonResponse(
+        {**metrics.snapshot(), "query_cache": query_cache.stats()}
+    )
+
+
+def location_autocomplete(request):
+    results = location_index.search(request.GET.get("q", ""))
+    return JsonResponse(
+        {"results": [{"id": pk, "name": name} for pk, name in results]}
+    )
@@ -0,0 +1,39 @@
+from django.db.models import F
+
+# Биты поля ``Post.visibility``.
+POST = 1
+CATEGORY = 2
+LOCATION = 4
+ALL = POST | CATEGORY | LOCATION
+
+# Публикация попадает в ленты, если опубликованы она сама и её
+# категория. Фильтр ``visibility__in`` по этим маскам идёт по индексу
+# и не требует соединения с таблицей категорий.
+LISTED = POST | CATEGORY
+LISTED_MASKS = [mask for mask in range(ALL + 1) if mask & LISTED == LISTED]
+
+# Поля публикации, от которых зависит маска.
+SOURCE_FIELDS = {
+    "is_published",
+    "category",
+    "category_id",
+    "location",
+    "location_id",
+}
+
+
+def mask(is_published, category, location):
+    """Маска видимости публикации по ней самой и её справочникам."""
+    bits = POST if is_published else 0
+    if category is not None and category.is_published:
+        bits |= CATEGORY
+    if location is not None and location.is_published:
+        bits |= LOCATION
+    return bits
+
+
+def set_bit(queryset, bit, value):
+    """Одним ``UPDATE`` ставит или снимает бит у всех публикаций."""
+    if value:
+        return queryset.update(visibility=F("visibility").bitor(bit))
+    return queryset.update(visibility=F("visibility").bitand(ALL & ~bit))
@@ -0,0 +1,91 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils.timezone import now
+
+from .benchmarks import bench_client
+from .feed_index import feed_index
+from .models import Post
+from .snapshots import categories
+from .visibility import LISTED_MASKS
+
+User = get_user_model()
+
+PER_PAGE = 10
+
+
+def feed_urls(feed, url, pages):
+    """Адреса первых ``pages`` страниц ленты, но не дальше её конца."""
+    _, _, count = feed_index.page(feed, 1, PER_PAGE)
+    num_pages = max((count + PER_PAGE - 1) // PER_PAGE, 1)
+    return [url] + [
+        f"{url}?page={number}"
+        for number in range(2, min(pages, num_pages) + 1)
+    ]
+
+
+def popular_posts(limit):
+    # Посещений мы не считаем; самые обсуждаемые публикации — лучшее
+    # приближение к самым читаемым.
+    return (
+        Post.objects.filter(
+            visibility__in=LISTED_MASKS, pub_date__lte=now()
+        )
+        .annotate(
+            comment_count=Count(
+                "comments", filter=Q(comments__is_deleted=False)
+            )
+        )
+        .order_by("-comment_count", "-pub_date")
+        .values_list("pk", flat=True)[:limit]
+    )
+
+
+def routes(pages=3, posts=20):
+    """Адреса, которые стоит отрендерить после запуска."""
+    urls = feed_urls("index", reverse("blog:index"), pages)
+    for category in categories.refresh().records.values():
+        if category.is_published:
+            urls += feed_urls(
+                f"category:{category.id}",
+                reverse("blog:category_posts", args=[category.slug]),
+                pages,
+            )
+    urls += [
+        reverse("blog:post_detail", args=[pk]) for pk in popular_posts(posts)
+    ]
+    urls += [reverse("pages:about"), reverse("pages:rules")]
+    return urls
+
+
+def warm_url(url, host):
+    started = time.perf_counter()
+    status = bench_client(HTTP_HOST=host).get(url).status_code
+    return url, status, time.perf_counter() - started
+
+
+def warm_url_in_thread(url, host):
+    try:
+        return warm_url(url, host)
+    finally:
+        # У каждого потока своё соединение с базой.
+        connection.close()
+
+
+def warm(urls, jobs=4, host="localhost"):
+    """Запрашивает адреса в ``jobs`` потоков.
+
+    Возвращает для каждого адреса код ответа и время в секундах.
+    Страницы ошибок не прогреваются: заготовки для них хранятся в памяти
+    каждого воркера, и процесс команды им не поможет.
+    """
+    if jobs <= 1:
+        return [warm_url(url, host) for url in urls]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return list(
+            executor.map(lambda url: warm_url_in_thread(url, host), urls)
+        )
@@ -0,0 +1,77 @@
+from django import forms
+from django.urls import reverse
+from django.utils.html import escapejs, format_html
+from django.utils.safestring import mark_safe
+
+from .snapshots import locations
+
+SCRIPT = """<script>
+(function () {
+  var input = document.getElementById("%(id)s");
+  var value = document.getElementById(input.dataset.value);
+  var list = document.getElementById(input.getAttribute("list"));
+  var found = {};
+  input.addEventListener("input", function () {
+    var text = input.value;
+    value.value = found[text] || "";
+    if (!text) { return; }
+    fetch(input.dataset.url + "?q=" + encodeURIComponent(text))
+      .then(function (response) { return response.json(); })
+      .then(function (data) {
+        list.innerHTML = "";
+        data.results.forEach(function (item) {
+          found[item.name] = item.id;
+          var option = document.createElement("option");
+          option.value = item.name;
+          list.appendChild(option);
+        });
+        value.value = found[input.value] || "";
+      });
+  });
+})();
+</script>"""
+
+
+class AutocompleteWidget(forms.Widget):
+    """Поле поиска по названию вместо списка всех вариантов.
+
+    Форма получает только id выбранной записи из скрытого поля, а
+    варианты подсказывает ``url`` по мере ввода.
+    """
+
+    def __init__(self, url_name, snapshot, attrs=None):
+        super().__init__({"class": "form-control", **(attrs or {})})
+        self.url_name = url_name
+        self.snapshot = snapshot
+
+    def label_for(self, value):
+        try:
+            record = self.snapshot.get(int(value))
+        except (TypeError, ValueError):
+            return ""
+        return record.name if record else ""
+
+    def render(self, name, value, attrs=None, renderer=None):
+        attrs = self.build_attrs(self.attrs, attrs)
+        widget_id = attrs.pop("id", f"id_{name}")
+        return format_html(
+            '<input type="hidden" name="{}" id="{}_value" value="{}">'
+            '<input type="text" id="{}" list="{}_list" data-value="{}_value" '
+            'data-url="{}" value="{}" autocomplete="off"{}>'
+            '<datalist id="{}_list"></datalist>{}',
+            name,
+            widget_id,
+            "" if value is None else value,
+            widget_id,
+            widget_id,
+            widget_id,
+            reverse(self.url_name),
+            self.label_for(value),
+            forms.utils.flatatt(attrs),
+            widget_id,
+            mark_safe(SCRIPT % {"id": escapejs(widget_id)}),
+        )
+
+
+def location_widget():
+    return AutocompleteWidget("blog:location_autocomplete", locations)
@@ -28,6 +28,7 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "blog.middleware.InvalidationBusMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -42,7 +43,8 @@ TEMPLATES_DIR = BASE_DIR / "templates"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "blog.lazy_context.DjangoTemplates",
+        "NAME": "django",
         "DIRS": [TEMPLATES_DIR],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -54,6 +56,22 @@ TEMPLATES = [
             ],
         },
     },
+    {
+        "BACKEND": "blog.lazy_context.Jinja2",
+        "NAME": "jinja2",
+        "DIRS": [BASE_DIR / "jinja2"],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            "environment": "blog.jinja.environment",
+            "keep_trailing_newline": True,
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+            ],
+        },
+    },
 ]
 
 WSGI_APPLICATION = "blogicum.wsgi.application"
@@ -65,6 +83,44 @@ DATABASES = {
     }
 }
 
+DB_BACKUP_DIR = BASE_DIR / "backups"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Общий для всех процессов уровень кэша блога.
+    "blog": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "blog",
+        "TIMEOUT": 600,
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+# Как часто процесс проверяет события сброса кэшей и сколько их хранить,
+# в секундах.
+INVALIDATION_BUS_POLL = 0.5
+INVALIDATION_BUS_RETENTION = 3600
+
+# Предельное время одного запроса к базе в просмотрах блога, в секундах.
+QUERY_TIME_LIMIT = 2.0
+
+# Выводить ленты из лёгких записей ``FeedRow`` вместо объектов ``Post``.
+BLOG_FEED_ROWS = False
+
+# Просмотры, которые рендерят страницы через Jinja2, например
+# ``["blog:index"]``. Шаблоны для них лежат в ``jinja2/``.
+BLOG_JINJA2_VIEWS = []
+
+# Вызывать контекстные процессоры debug, auth и messages только тогда,
+# когда шаблон читает их значения.
+BLOG_LAZY_CONTEXT = True
+
+# Страница публикации, у которой комментариев больше этого числа,
+# отдаётся потоком.
+BLOG_STREAM_COMMENTS = 200
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
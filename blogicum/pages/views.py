@@ -1,7 +1,16 @@
+from django.conf import settings
 from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
 from django.shortcuts import render, redirect
+from django.template import Context, Template
+from django.template.loader import render_to_string
 from django.views.generic import TemplateView
 
+URL_MARKER = "\x00request_url\x00"
+
+_prerendered = {}
+
 
 class AboutPageView(TemplateView):
     template_name = "pages/about.html"
@@ -11,16 +20,52 @@ class RulesPageView(TemplateView):
     template_name = "pages/rules.html"
 
 
+def prerendered(template_name):
+    """Страница, заранее отрендеренная для анонимного пользователя.
+
+    От шаблона остаётся плоский текст с единственной подстановкой —
+    адресом запроса, так что наследование, включения и ``{% url %}``
+    при ответе уже не выполняются.
+    """
+    template = _prerendered.get(template_name)
+    if template is None:
+        body = render_to_string(
+            template_name,
+            {"request_url": URL_MARKER, "user": AnonymousUser()},
+        )
+        source = "{{ request_url }}".join(
+            "{% verbatim %}" + part + "{% endverbatim %}"
+            for part in body.split(URL_MARKER)
+        )
+        template = Template(source)
+        template.name = template_name
+        if not settings.DEBUG:
+            _prerendered[template_name] = template
+    return template
+
+
+def error_page(request, template_name, status):
+    # Шапка зависит от пользователя, поэтому вошедшим рендерим как обычно.
+    user = getattr(request, "user", None)
+    context = {"request_url": request.build_absolute_uri()}
+    if user is not None and user.is_authenticated:
+        return render(request, template_name, context, status=status)
+    body = prerendered(template_name).render(Context(context))
+    return HttpResponse(body, status=status)
+
+
 def custom_403(request, reason=""):
-    return render(request, "pages/403csrf.html", status=403)
+    return error_page(request, "pages/403csrf.html", 403)
 
 
 def custom_404(request, exception):
-    return render(request, "pages/404.html", status=404)
+    return error_page(request, "pages/404.html", 404)
 
 
 def custom_500(request):
-    return render(request, "pages/500.html", status=500)
+    # Ошибка могла случиться в базе или в сессии: пользователя не трогаем.
+    body = prerendered("pages/500.html").render(Context())
+    return HttpResponse(body, status=500)
 
 
 def register(request):
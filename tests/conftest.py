@@ -41,6 +41,34 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(scope="session")
+def blog_cache_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("blog-cache")
+
+
+@pytest.fixture(autouse=True)
+def clear_blog_cache(blog_cache_dir):
+    from django.conf import settings
+    from django.core.cache import caches
+    from blog.cache import feed_cache
+    from blog.form_cache import form_cache
+    from blog.page_cache import page_cache
+    from blog.query_cache import query_cache
+
+    # Кэш разработчика или сервера из settings.py тесты не трогают.
+    test_caches = {
+        **settings.CACHES,
+        "blog": {**settings.CACHES["blog"], "LOCATION": str(blog_cache_dir)},
+    }
+    with override_settings(CACHES=test_caches):
+        caches["blog"].clear()
+        feed_cache.clear()
+        form_cache.clear()
+        page_cache.clear()
+        query_cache.tier.clear()
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,47 @@
+import pytest
+
+from blog.autocomplete import location_index
+from blog.forms import PostForm
+
+
+@pytest.mark.django_db
+def test_prefix_search_skips_hidden_locations(mixer):
+    for name in ("Москва", "Мурманск", "Минск", "Омск"):
+        mixer.blend("blog.Location", name=name, is_published=True)
+    mixer.blend("blog.Location", name="Магадан", is_published=False)
+    assert [name for _, name in location_index.search("м")] == [
+        "Минск",
+        "Москва",
+        "Мурманск",
+    ]
+    assert [name for _, name in location_index.search("МО", limit=1)] == [
+        "Москва"
+    ]
+    assert location_index.search("") == []
+
+
+@pytest.mark.django_db
+def test_autocomplete_endpoint(client, mixer):
+    location = mixer.blend("blog.Location", name="Казань", is_published=True)
+    response = client.get("/locations/autocomplete/", {"q": "каз"})
+    assert response.json() == {
+        "results": [{"id": location.pk, "name": "Казань"}]
+    }
+    mixer.blend("blog.Location", name="Калуга", is_published=True)
+    response = client.get("/locations/autocomplete/", {"q": "кал"})
+    assert [item["name"] for item in response.json()["results"]] == [
+        "Калуга"
+    ], "Убедитесь, что новое место сразу находится поиском."
+
+
+@pytest.mark.django_db
+def test_post_form_does_not_list_locations(mixer):
+    locations = mixer.cycle(5).blend("blog.Location", is_published=True)
+    html = str(PostForm()["location"])
+    assert "<option" not in html and locations[0].name not in html, (
+        "Убедитесь, что форма публикации не выводит список всех мест."
+    )
+    form = PostForm(data={"location": locations[2].pk})
+    form.is_valid()
+    assert "location" not in form.errors
+    assert form.cleaned_data["location"] == locations[2]
@@ -0,0 +1,59 @@
+import pytest
+from django.apps import apps
+
+from blog.backfills import BACKFILLS, Backfill, RunBackfill, register
+from blog.models import BackfillCheckpoint, Comment, Post
+
+
+def upper_text(comment):
+    comment.text = comment.text.upper()
+    return True
+
+
+@pytest.fixture
+def upper_backfill():
+    backfill = register(
+        Backfill(
+            "test_upper_comments",
+            "blog.Comment",
+            ["text"],
+            upper_text,
+            batch_size=2,
+        )
+    )
+    yield backfill
+    BACKFILLS.pop(backfill.name)
+
+
+@pytest.mark.django_db
+def test_backfill_resumes_from_checkpoint(mixer, upper_backfill):
+    comments = mixer.cycle(5).blend("blog.Comment", text="текст")
+
+    steps = upper_backfill.run()
+    assert next(steps) == (2, 2)
+    steps.close()
+    checkpoint = BackfillCheckpoint.objects.get(name=upper_backfill.name)
+    assert (
+        checkpoint.last_pk == comments[1].id
+    ), "Убедитесь, что после каждой пачки сохраняется контрольная точка."
+
+    RunBackfill(upper_backfill.name).forwards(apps, None)
+    assert set(Comment.objects.values_list("text", flat=True)) == {"ТЕКСТ"}
+    checkpoint.refresh_from_db()
+    assert checkpoint.rows_done == 5
+    assert checkpoint.finished_at is not None
+
+
+@pytest.mark.django_db
+def test_post_summary_backfill(mixer):
+    posts = mixer.cycle(3).blend("blog.Post", text="слово " * 30)
+    Post.objects.update(excerpt="", word_count=0)
+    # Миграция уже выполнила бэкфилл на пустой базе.
+    BACKFILLS["post_summary"].reset()
+    for _ in BACKFILLS["post_summary"].run():
+        pass
+    post = Post.objects.get(pk=posts[0].pk)
+    assert post.word_count == 30
+    assert post.excerpt == " ".join(["слово"] * 10) + " …", (
+        "Убедитесь, что бэкфилл заполняет анонс и число слов."
+    )
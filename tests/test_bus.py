@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+from blog.bus import InvalidationBus
+from blog.metrics import metrics
+from blog.models import InvalidationEvent
+
+
+@pytest.mark.django_db
+def test_foreign_events_are_applied():
+    bus = InvalidationBus(poll_interval=0.5)
+    received = []
+    bus.subscribe("blog.post", received.append)
+    bus.poll(force=True)
+
+    InvalidationEvent.objects.create(
+        topic="blog.post",
+        key="7",
+        origin="другой-узел:1",
+        created_at=time.time() - 0.2,
+    )
+    metrics.reset()
+    bus.poll(force=True)
+    assert received == ["7"], (
+        "Убедитесь, что процесс применяет события сброса кэша из шины."
+    )
+    delay = metrics.snapshot()["timings"]["bus.propagation_delay"]
+    assert delay["last"] >= 0.2
+
+    bus.poll(force=True)
+    assert received == ["7"], "Событие не должно применяться повторно."
+
+
+@pytest.mark.django_db
+def test_gap_clears_everything():
+    bus = InvalidationBus()
+    cleared = []
+    bus.on_gap(lambda: cleared.append(True))
+    bus.last_id = 0
+    for key in range(3):
+        InvalidationEvent.objects.create(
+            topic="blog.post", key=key, origin="x:1", created_at=time.time()
+        )
+    InvalidationEvent.objects.order_by("id").first().delete()
+    bus.poll(force=True)
+    assert cleared, (
+        "Убедитесь, что при пропуске событий процесс сбрасывает кэш целиком."
+    )
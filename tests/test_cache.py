@@ -0,0 +1,81 @@
+import threading
+import time
+
+from blog.cache import TwoTierCache
+
+
+def test_single_flight_recompute():
+    cache = TwoTierCache(beta=0)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return "лента"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                cache.get_or_compute("test", "single", compute)
+            )
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["лента"] * 8
+    assert len(calls) == 1, (
+        "Убедитесь, что значение пересчитывается одним запросом на ключ."
+    )
+
+
+def test_stale_value_served_while_refreshing():
+    cache = TwoTierCache(beta=0)
+    cache.get_or_compute("test", "stale", lambda: "старое", ttl=0)
+    full_key = cache.make_key("test", "stale")
+    assert cache.acquire(full_key)
+    try:
+        value = cache.get_or_compute("test", "stale", lambda: "новое", ttl=0)
+    finally:
+        cache.release(full_key)
+    assert value == "старое", (
+        "Убедитесь, что пока значение пересчитывается, отдаётся устаревшее."
+    )
+    assert cache.get_or_compute("test", "stale", lambda: "новое") == "новое"
+
+
+def test_invalidate_namespace():
+    cache = TwoTierCache()
+    assert cache.get_or_compute("test", "key", lambda: 1) == 1
+    assert cache.get_or_compute("test", "key", lambda: 2) == 1
+    cache.invalidate("test")
+    assert cache.get_or_compute("test", "key", lambda: 2) == 2
+
+
+def test_nested_computes_do_not_deadlock():
+    cache = TwoTierCache(beta=0)
+
+    def outer():
+        # Ключей больше, чем было общих блокировок, так что хотя бы
+        # два из них раньше попадали бы на одну блокировку.
+        return [
+            cache.get_or_compute("test", f"inner:{i}", lambda: i)
+            for i in range(200)
+        ]
+
+    result = []
+    thread = threading.Thread(
+        target=lambda: result.append(
+            cache.get_or_compute("test", "outer", outer)
+        ),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(timeout=10)
+    assert result == [list(range(200))], (
+        "Убедитесь, что расчёт значения может запрашивать другие ключи."
+    )
+    assert not cache.key_locks
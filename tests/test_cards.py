@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import pytest
+from django.db.models import Count
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.cards import render_post_card
+from blog.feed_rows import feed_rows
+from blog.models import Post
+
+
+@pytest.fixture
+def card_posts(
+    mixer,
+    user,
+    published_category,
+    published_location,
+    post_with_published_location,
+):
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    hidden_location = mixer.blend("blog.Location", is_published=False)
+    variants = [
+        {"location": published_location},
+        {"location": hidden_location, "is_published": False},
+        {"category": hidden_category, "location": None},
+        {"category": None},
+        {"title": "<b>Заголовок & {скобки}</b>"},
+    ]
+    for variant in variants:
+        mixer.blend(
+            "blog.Post",
+            author=user,
+            **{
+                "category": published_category,
+                "pub_date": timezone.now() - timedelta(days=1),
+                **variant,
+            },
+        )
+    return Post.objects.annotate(comment_count=Count("comments"))
+
+
+@pytest.mark.django_db
+def test_compiled_card_matches_template(card_posts):
+    assert any(post.image for post in card_posts)
+    for post in list(card_posts) + feed_rows(card_posts):
+        expected = render_to_string("includes/post_card.html", {"post": post})
+        assert render_post_card(post) == expected, (
+            "Убедитесь, что карточка публикации совпадает с шаблоном "
+            "`includes/post_card.html` байт в байт."
+        )
+
+
+@pytest.mark.django_db
+def test_post_without_category_in_own_profile(user_client, user, mixer):
+    mixer.blend("blog.Post", author=user, category=None, title="Без рубрики")
+    response = user_client.get(reverse("blog:profile", args=[user.username]))
+    assert response.status_code == 200
+    assert (
+        "Без рубрики" in response.content.decode()
+    ), "Публикация без категории должна выводиться в профиле автора."
@@ -0,0 +1,36 @@
+import pytest
+from django.db import connection
+
+from blog.fields import COMPRESSED_MARKER, compress_text, decompress_text
+from blog.models import Post
+
+
+def test_compress_round_trip():
+    long_text = "длинный текст публикации " * 100
+    packed = compress_text(long_text, min_length=512, level=6)
+    assert packed.startswith(COMPRESSED_MARKER), (
+        "Убедитесь, что длинный текст сохраняется в сжатом виде."
+    )
+    assert len(packed) < len(long_text.encode("utf-8"))
+    assert decompress_text(packed) == long_text
+
+    assert compress_text("короткий", 512, 6) == "короткий", (
+        "Убедитесь, что текст короче порога сохраняется без изменений."
+    )
+    tricky = COMPRESSED_MARKER + "не сжатый текст"
+    assert decompress_text(compress_text(tricky, 512, 6)) == tricky
+
+
+@pytest.mark.django_db
+def test_post_text_stored_compressed(mixer):
+    long_text = "слово " * 1000
+    post = mixer.blend("blog.Post", text=long_text)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT text FROM blog_post WHERE id = %s", [post.id]
+        )
+        (raw,) = cursor.fetchone()
+    assert raw.startswith(COMPRESSED_MARKER), (
+        "Убедитесь, что длинный `Post.text` хранится в базе в сжатом виде."
+    )
+    assert Post.objects.get(id=post.id).text == long_text
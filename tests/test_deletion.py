@@ -0,0 +1,65 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from blog.deletion import tombstone_post, tombstone_user
+from blog.models import Comment, Post, Tombstone
+
+
+@pytest.mark.django_db
+def test_tombstoned_post_hidden_then_purged(mixer, user_client):
+    post = mixer.blend("blog.Post", is_published=True)
+    mixer.cycle(5).blend("blog.Comment", post=post)
+
+    tombstone_post(post)
+    assert not Post.objects.filter(id=post.id).exists(), (
+        "Убедитесь, что помеченная на удаление публикация сразу скрывается."
+    )
+    assert Post.all_objects.filter(id=post.id).exists()
+    assert user_client.get(f"/posts/{post.id}/").status_code == 404
+
+    call_command("purge_deleted", batch_size=2, stdout=StringIO())
+    assert not Post.all_objects.filter(id=post.id).exists()
+    assert not Comment.all_objects.filter(post_id=post.id).exists()
+    assert not Tombstone.objects.exists()
+
+
+@pytest.mark.django_db
+def test_tombstoned_user_purged(mixer, another_user, user_client):
+    posts = mixer.cycle(3).blend("blog.Post", author=another_user)
+    mixer.cycle(3).blend("blog.Comment", author=another_user, post=posts[0])
+
+    tombstone_user(another_user)
+    assert not Post.objects.filter(author=another_user).exists()
+    response = user_client.get(f"/profile/{another_user.username}/")
+    assert response.status_code == 404, (
+        "Убедитесь, что страница удаляемого пользователя сразу недоступна."
+    )
+
+    call_command("purge_deleted", batch_size=2, stdout=StringIO())
+    User = get_user_model()
+    assert not User.objects.filter(id=another_user.id).exists()
+    assert not Post.all_objects.filter(author_id=another_user.id).exists()
+
+
+@pytest.mark.django_db
+def test_purge_publishes_once_per_tombstone(mixer, monkeypatch):
+    from blog import deletion, signals
+
+    post = mixer.blend("blog.Post")
+    mixer.cycle(20).blend("blog.Comment", post=post)
+    tombstone_post(post)
+    published = []
+
+    def record(*args, **kwargs):
+        published.append(args)
+
+    monkeypatch.setattr(signals, "publish_change", record)
+    monkeypatch.setattr(deletion, "publish_change", record)
+    call_command("purge_deleted", batch_size=5, stdout=StringIO())
+    assert not Comment.all_objects.filter(post_id=post.id).exists()
+    assert len(published) == 1, (
+        "Убедитесь, что очистка не сообщает кэшам о каждой удалённой строке."
+    )
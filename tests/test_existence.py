@@ -0,0 +1,45 @@
+import pytest
+from django.http import Http404
+
+from blog.existence import BloomFilter
+from blog.models import Post
+from blog.object_cache import get_cached_or_404
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    for value in range(1000):
+        bloom.add(value)
+    assert all(str(value) in bloom for value in range(1000))
+    false_positives = sum(str(value) in bloom for value in range(1000, 11000))
+    assert false_positives < 300
+
+
+@pytest.mark.django_db
+def test_missing_post_rejected_without_queries(
+    post_with_published_location, django_assert_num_queries
+):
+    post = post_with_published_location
+    get_cached_or_404(Post, pk=post.pk)
+    with django_assert_num_queries(0):
+        with pytest.raises(Http404):
+            get_cached_or_404(Post, pk=post.pk + 1000)
+
+
+@pytest.mark.django_db
+def test_new_objects_pass_filter(mixer, post_with_published_location):
+    post = post_with_published_location
+    get_cached_or_404(Post, pk=post.pk)
+    new_post = mixer.blend("blog.Post", author=post.author)
+    assert (
+        get_cached_or_404(Post, pk=new_post.pk) == new_post
+    ), "Убедитесь, что новые публикации добавляются в фильтр существования."
+
+
+@pytest.mark.django_db
+def test_error_page_prerendered(client, django_assert_num_queries):
+    client.get("/posts/100500/")
+    with django_assert_num_queries(0):
+        response = client.get("/posts/100501/")
+    assert response.status_code == 404
+    assert "/posts/100501/" in response.content.decode()
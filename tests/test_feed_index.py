@@ -0,0 +1,78 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.feed_index import feed_index
+
+
+@pytest.mark.django_db
+def test_index_updated_incrementally(mixer, user, published_category):
+    posts = mixer.cycle(3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=(
+            timezone.now() - timedelta(days=days) for days in range(1, 4)
+        ),
+    )
+    ids, _, count = feed_index.page("index", 1, 10)
+    assert ids == [post.pk for post in posts] and count == 3
+
+    newest = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now(),
+    )
+    posts[1].is_published = False
+    posts[1].save()
+    ids, _, _ = feed_index.page("index", 1, 10)
+    assert ids == [
+        newest.pk,
+        posts[0].pk,
+        posts[2].pk,
+    ], "Убедитесь, что индекс лент обновляется при сохранении публикаций."
+
+
+@pytest.mark.django_db
+def test_scheduled_posts_hidden_until_publication(
+    mixer, user, published_category
+):
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    ids, _, count = feed_index.page(f"profile:{user.pk}", 1, 10)
+    assert ids == [] and count == 0
+
+
+@pytest.mark.django_db
+def test_post_moved_between_categories(
+    mixer, user, published_category, another_category
+):
+    post = mixer.blend("blog.Post", author=user, category=published_category)
+    feed_index.page(f"category:{published_category.pk}", 1, 10)
+    post.category = another_category
+    post.save()
+    assert feed_index.page(f"category:{published_category.pk}", 1, 10)[0] == []
+    assert feed_index.page(f"category:{another_category.pk}", 1, 10)[0] == [
+        post.pk
+    ]
+
+
+@pytest.mark.django_db
+def test_rebuild_command(mixer, user, published_category):
+    post = mixer.blend("blog.Post", author=user, category=published_category)
+    out = StringIO()
+    call_command("rebuild_feed_index", stdout=out)
+    assert feed_index.page("index", 1, 10)[0] == [post.pk]
+    assert "index: 1" in out.getvalue()
+    assert f"category:{published_category.pk}: 1" in out.getvalue()
+    assert f"profile:{user.pk}: 1" in out.getvalue(), (
+        "Убедитесь, что команда выводит число публикаций в каждой ленте."
+    )
@@ -0,0 +1,53 @@
+import pickle
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.feed_rows import FeedRow, feed_rows
+from blog.models import Post
+from blog.page_cache import page_cache
+from blog.views import COMMENT_COUNT
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category, published_location):
+    posts = mixer.cycle(3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        pub_date=(
+            timezone.now() - timedelta(days=days) for days in range(1, 4)
+        ),
+    )
+    mixer.blend("blog.Comment", post=posts[0])
+    return posts
+
+
+@pytest.mark.django_db
+def test_feed_rows_render_same_pages(client, settings, feed_posts, user):
+    urls = ["/", f"/profile/{user.username}/"]
+    settings.BLOG_FEED_ROWS = False
+    expected = [client.get(url).content for url in urls]
+    settings.BLOG_FEED_ROWS = True
+    page_cache.invalidate("page")
+    response = client.get(urls[0])
+    assert isinstance(response.context["page_obj"][0], FeedRow)
+    assert [response.content] + [
+        client.get(url).content for url in urls[1:]
+    ] == expected, (
+        "Убедитесь, что ленты из `FeedRow` совпадают с лентами из `Post`."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_row_fields_and_pickle(feed_posts):
+    queryset = Post.objects.annotate(comment_count=COMMENT_COUNT)
+    row = {row.pk: row for row in feed_rows(queryset)}[feed_posts[0].pk]
+    assert row.author.username == feed_posts[0].author.username
+    assert row.comment_count == 1
+    assert bool(row.image) == bool(feed_posts[0].image)
+    assert not hasattr(row, "__dict__")
+    copy = pickle.loads(pickle.dumps(row))
+    assert (copy.title, copy.author) == (row.title, row.author)
@@ -0,0 +1,34 @@
+import pytest
+from django_bootstrap5.forms import render_form
+
+from blog.form_cache import form_cache, render_cached_form
+from blog.forms import CommentForm, PostForm
+
+
+@pytest.mark.django_db
+def test_cached_markup_matches_bootstrap():
+    for form_class in (CommentForm, PostForm):
+        expected = str(render_form(form_class()))
+        assert render_cached_form(form_class()) == expected
+        assert render_cached_form(form_class()) == expected, (
+            "Убедитесь, что разметка формы из кэша совпадает с "
+            "разметкой `bootstrap_form`."
+        )
+
+
+@pytest.mark.django_db
+def test_new_category_shows_up_in_cached_form(mixer):
+    render_cached_form(PostForm())
+    category = mixer.blend("blog.Category", title="Свежая категория")
+    assert category.title in render_cached_form(PostForm()), (
+        "Убедитесь, что кэш разметки сбрасывается при изменении вариантов "
+        "полей выбора."
+    )
+
+
+@pytest.mark.django_db
+def test_bound_form_is_not_cached():
+    form = CommentForm(data={"text": ""})
+    assert "is-invalid" in render_cached_form(form)
+    form_cache.clear()
+    assert "is-invalid" not in render_cached_form(CommentForm())
@@ -0,0 +1,78 @@
+import re
+
+import pytest
+from django.urls import reverse
+
+from blog.page_cache import page_cache
+
+CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="[^"]+"')
+VIEWS = [
+    "blog:index",
+    "blog:category_posts",
+    "blog:profile",
+    "blog:post_detail",
+]
+
+
+@pytest.fixture
+def jinja_post(mixer, user, another_user, many_posts_with_published_locations):
+    post = many_posts_with_published_locations[0]
+    post.text = "Текст с **разметкой** и <script>alert(1)</script>"
+    post.save()
+    for author in (user, another_user):
+        mixer.blend(
+            "blog.Comment", post=post, author=author, text="<b>Привет</b>"
+        )
+    return post
+
+
+def normalize(response):
+    # Строки с тегами ``{% load %}`` оставляют в выводе Django пустые
+    # строки, поэтому пробелы сравниваются без учёта их количества.
+    # Токен CSRF маскируется заново в каждом ответе.
+    content = CSRF_RE.sub("", response.content.decode())
+    return " ".join(content.split())
+
+
+def urls(post):
+    return [
+        reverse("blog:index"),
+        reverse("blog:index") + "?page=2",
+        reverse("blog:category_posts", args=[post.category.slug]),
+        reverse("blog:profile", args=[post.author.username]),
+        reverse("blog:post_detail", args=[post.id]),
+    ]
+
+
+def render_all(client, post, settings, views):
+    settings.BLOG_JINJA2_VIEWS = views
+    page_cache.invalidate("page")
+    return {url: client.get(url) for url in urls(post)}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("client_name", ["client", "user_client"])
+def test_jinja_pages_match_django(request, client_name, settings, jinja_post):
+    client = request.getfixturevalue(client_name)
+    django_pages = render_all(client, jinja_post, settings, [])
+    jinja_pages = render_all(client, jinja_post, settings, VIEWS)
+    for url, response in jinja_pages.items():
+        assert response.status_code == 200
+        assert normalize(response) == normalize(django_pages[url]), (
+            f"Страница `{url}`, отрендеренная Jinja2, должна совпадать "
+            "со страницей из шаблонов Django."
+        )
+
+
+@pytest.mark.django_db
+def test_engine_chosen_per_view(client, settings, jinja_post):
+    settings.BLOG_JINJA2_VIEWS = ["blog:index"]
+    response = client.get(reverse("blog:index"))
+    assert "blog/index.html" not in [
+        t.name for t in response.templates
+    ], "Страница из Jinja2 не должна рендериться шаблонами Django."
+    response = client.get(reverse("blog:post_detail", args=[jinja_post.id]))
+    assert "blog/detail.html" in [t.name for t in response.templates], (
+        "Остальные страницы должны по-прежнему рендериться шаблонами "
+        "Django."
+    )
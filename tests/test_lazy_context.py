@@ -0,0 +1,60 @@
+import pytest
+from django.urls import reverse
+
+from blog.metrics import metrics
+
+
+def processor_calls():
+    timings = metrics.snapshot()["timings"]
+    return {
+        name: timings.get(f"context.{name}", {}).get("count", 0)
+        for name in ("debug", "auth", "messages")
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "lazy, expected",
+    [
+        (True, {"debug": 0, "auth": 1, "messages": 0}),
+        (False, {"debug": 1, "auth": 1, "messages": 1}),
+    ],
+)
+def test_processors_run_when_read(client, settings, lazy, expected):
+    settings.BLOG_LAZY_CONTEXT = lazy
+    client.get(reverse("blog:index"))
+    metrics.reset()
+    client.get(reverse("blog:index"))
+    assert processor_calls() == expected, (
+        "Ленивые контекстные процессоры должны вызываться только при "
+        "чтении их значений шаблоном."
+    )
+
+
+@pytest.mark.django_db
+def test_processor_runs_once_per_request(
+    user_client, settings, post_with_published_location
+):
+    settings.BLOG_LAZY_CONTEXT = True
+    post_with_published_location.comments.create(
+        text="Комментарий", author=post_with_published_location.author
+    )
+    url = reverse("blog:post_detail", args=[post_with_published_location.id])
+    user_client.get(url)
+    metrics.reset()
+    user_client.get(url)
+    assert processor_calls()["auth"] == 1, (
+        "Процессор должен вызываться не больше раза за запрос, сколько бы "
+        "дырок ни было на странице."
+    )
+
+
+@pytest.mark.django_db
+def test_lazy_values(user_client, user, settings):
+    settings.BLOG_LAZY_CONTEXT = True
+    response = user_client.get(reverse("blog:index"))
+    assert response.context["user"] == user
+    assert list(response.context["messages"]) == []
+    assert user.username in response.content.decode(), (
+        "В шапке должно выводиться имя пользователя из ленивого контекста."
+    )
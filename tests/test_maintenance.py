@@ -0,0 +1,58 @@
+import sqlite3
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog import maintenance
+from blog.models import DatabaseSizeSample, Post
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backup_round_trip(mixer, tmp_path):
+    mixer.cycle(5).blend("blog.Post")
+    target = tmp_path / "backup.sqlite3"
+    maintenance.backup(target, pages=1, sleep=0)
+    copy = sqlite3.connect(str(target))
+    try:
+        (count,) = copy.execute("SELECT COUNT(*) FROM blog_post").fetchone()
+    finally:
+        copy.close()
+    assert count == Post.all_objects.count() == 5, (
+        "Убедитесь, что резервная копия содержит все строки таблицы."
+    )
+
+
+@pytest.mark.django_db
+def test_size_deltas_against_previous_run():
+    first = maintenance.record_sizes()
+    assert first, "Убедитесь, что размеры таблиц записываются."
+    earlier = first[0].taken_at - timedelta(minutes=5)
+    DatabaseSizeSample.objects.filter(pk__in=[s.pk for s in first]).update(
+        taken_at=earlier
+    )
+    second = maintenance.record_sizes()
+    previous = maintenance.previous_sizes(second[0].taken_at)
+    assert previous == {sample.name: sample.size for sample in first}
+    assert maintenance.previous_sizes(earlier) == {}
+
+
+@pytest.mark.django_db
+def test_incremental_vacuum_disabled():
+    assert maintenance.incremental_vacuum(pages=10) is None
+    out = StringIO()
+    call_command("maintain_db", stdout=out)
+    assert "--enable-incremental-vacuum" in out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backup_command_keeps_latest_copies(settings, tmp_path):
+    settings.DB_BACKUP_DIR = tmp_path
+    for day in range(1, 4):
+        (tmp_path / f"db-2020010{day}-000000.sqlite3").touch()
+    call_command("backup_db", keep=2, sleep=0, stdout=StringIO())
+    kept = sorted(path.name for path in tmp_path.glob("db-*.sqlite3"))
+    assert len(kept) == 2 and kept[0] == "db-20200103-000000.sqlite3", (
+        "Убедитесь, что `--keep` оставляет только последние копии."
+    )
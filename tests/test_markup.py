@@ -0,0 +1,54 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.markup import render_markdown, sanitize
+from blog.models import Post
+
+
+def test_markdown_is_sanitized():
+    html = render_markdown(
+        "**жирный**\n<script>alert(1)</script> [ссылка](javascript:alert(1))"
+    )
+    assert "<strong>жирный</strong><br>" in html
+    assert "<script>" not in html and "javascript:" not in html, (
+        "Убедитесь, что HTML из Markdown очищается от опасной разметки."
+    )
+    assert sanitize('<p onclick="x()">a<img src="x" onerror="y()">') == (
+        '<p>a<img src="x"></p>'
+    )
+
+
+@pytest.mark.django_db
+def test_html_stored_on_save_and_shown(client, mixer, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        category=published_category,
+        pub_date=timezone.now() - timedelta(days=1),
+        text="Текст с *курсивом*",
+    )
+    mixer.blend("blog.Comment", post=post, text="Ответ **жирным**")
+    assert post.text_html == "<p>Текст с <em>курсивом</em></p>"
+    content = client.get(f"/posts/{post.pk}/").content.decode()
+    assert "<em>курсивом</em>" in content
+    assert '<div class="card-text"><p>Текст' in content, (
+        "Блочная разметка текста не должна вкладываться в абзац."
+    )
+    assert "<strong>жирным</strong>" in content, (
+        "Убедитесь, что страница публикации выводит сохранённый HTML "
+        "публикации и комментариев."
+    )
+
+
+@pytest.mark.django_db
+def test_rerender_markup_command(mixer):
+    post = mixer.blend("blog.Post", text="# Заголовок")
+    Post.objects.filter(pk=post.pk).update(text_html="устарело")
+    call_command("rerender_markup", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.text_html == "<h1>Заголовок</h1>", (
+        "Убедитесь, что команда заново рендерит HTML публикаций."
+    )
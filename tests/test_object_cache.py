@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import pytest
+from django.http import Http404
+from django.urls import reverse
+
+from blog.models import Category, Comment
+from blog.object_cache import get_cached_or_404, object_cache
+
+
+@pytest.mark.django_db
+def test_repeated_lookups_hit_cache(
+    published_category, django_assert_num_queries
+):
+    slug = published_category.slug
+    get_cached_or_404(Category, slug=slug)
+    with django_assert_num_queries(0):
+        category = get_cached_or_404(Category, slug=slug, is_published=True)
+    assert category == published_category
+
+    published_category.title = "Новое название"
+    published_category.save()
+    assert get_cached_or_404(Category, slug=slug).title == "Новое название", (
+        "Убедитесь, что кэш объекта сбрасывается при сохранении."
+    )
+
+
+@pytest.mark.django_db
+def test_negative_results_cached(mixer, django_assert_num_queries):
+    assert object_cache.get(Category, "slug", "net-takoi") is None
+    with django_assert_num_queries(0):
+        assert object_cache.get(Category, "slug", "net-takoi") is None
+
+    mixer.blend("blog.Category", slug="net-takoi")
+    assert object_cache.get(Category, "slug", "net-takoi") is not None, (
+        "Убедитесь, что созданный объект не скрыт закэшированным промахом."
+    )
+
+
+@pytest.mark.django_db
+def test_renamed_alias_not_served(published_category):
+    old_slug = published_category.slug
+    get_cached_or_404(Category, slug=old_slug)
+    published_category.slug = "novyi-slug"
+    published_category.save()
+    with pytest.raises(Http404):
+        get_cached_or_404(Category, slug=old_slug)
+
+
+@pytest.mark.django_db
+def test_edit_ignores_stale_cached_copy(user_client, user, mixer):
+    comment = mixer.blend("blog.Comment", author=user, text="Старый текст")
+    get_cached_or_404(Comment, pk=comment.pk)
+    moved = comment.created_at - timedelta(days=1)
+    Comment.objects.filter(pk=comment.pk).update(created_at=moved)
+    user_client.post(
+        reverse("blog:edit_comment", args=[comment.post_id, comment.pk]),
+        {"text": "Новый текст"},
+    )
+    comment.refresh_from_db()
+    assert comment.text == "Новый текст"
+    assert comment.created_at == moved, (
+        "Убедитесь, что изменяющие представления не сохраняют устаревшую "
+        "копию объекта из кэша."
+    )
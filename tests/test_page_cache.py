@@ -0,0 +1,76 @@
+import pytest
+from django.urls import reverse
+
+
+@pytest.mark.django_db
+def test_page_body_shared_between_users(
+    post_with_published_location, user, user_client, another_user_client
+):
+    post = post_with_published_location
+    url = reverse("blog:post_detail", args=[post.pk])
+    edit_url = reverse("blog:edit_post", args=[post.pk])
+
+    owner_page = user_client.get(url).content.decode()
+    other_page = another_user_client.get(url).content.decode()
+    assert post.author == user
+    assert edit_url in owner_page
+    assert (
+        edit_url not in other_page
+    ), "Убедитесь, что кнопки владельца не попадают в общий кэш страницы."
+    assert f"@{user.username}" in owner_page
+    assert "csrfmiddlewaretoken" in other_page
+
+
+@pytest.mark.django_db
+def test_cached_page_skips_main_render(
+    post_with_published_location, user_client, django_assert_max_num_queries
+):
+    url = reverse("blog:index")
+    user_client.get(url)
+    with django_assert_max_num_queries(3):
+        response = user_client.get(url)
+    assert post_with_published_location.title in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_query_string_does_not_create_entries(
+    post_with_published_location, user_client
+):
+    from blog.page_cache import page_cache
+
+    url = reverse("blog:index")
+    user_client.get(url)
+    entries = len(page_cache.local.data)
+    for junk in range(5):
+        user_client.get(f"{url}?x={junk}")
+    assert len(page_cache.local.data) == entries, (
+        "Убедитесь, что лишние параметры запроса не плодят записи кэша."
+    )
+
+
+@pytest.mark.django_db
+def test_foreign_owner_holes_not_rendered(
+    mixer,
+    monkeypatch,
+    post_with_published_location,
+    another_user_client,
+):
+    from blog import page_cache
+
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post, author=post.author)
+    url = reverse("blog:post_detail", args=[post.pk])
+    another_user_client.get(url)
+    rendered = []
+    get_template = page_cache.get_template
+
+    def recording_get_template(name):
+        rendered.append(name)
+        return get_template(name)
+
+    monkeypatch.setattr(page_cache, "get_template", recording_get_template)
+    another_user_client.get(url)
+    assert "includes/header.html" in rendered
+    assert "includes/comment_controls.html" not in rendered, (
+        "Убедитесь, что кнопки чужих комментариев не рендерятся."
+    )
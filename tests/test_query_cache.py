@@ -0,0 +1,72 @@
+import pytest
+
+from blog.models import Category, Location
+from blog.query_cache import cache_queries, query_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    query_cache.reset()
+
+
+@pytest.mark.django_db
+def test_repeated_query_served_from_cache(
+    published_category, django_assert_num_queries
+):
+    list(Category.objects.filter(is_published=True).cached())
+    Category.objects.cached().count()
+    with django_assert_num_queries(0):
+        categories = list(Category.objects.filter(is_published=True).cached())
+        assert Category.objects.cached().count() == 1
+    assert categories == [published_category]
+    stats = list(query_cache.stats().values())
+    select = next(item for item in stats if "is_published" in item["sql"])
+    assert (select["hit"], select["miss"]) == (1, 1), (
+        "Убедитесь, что попадания и промахи считаются по отпечатку запроса."
+    )
+
+
+@pytest.mark.django_db
+def test_not_cached_without_opt_in(
+    published_category, django_assert_num_queries
+):
+    list(Category.objects.all())
+    with django_assert_num_queries(1):
+        list(Category.objects.all())
+    with cache_queries():
+        list(Category.objects.all())
+        with django_assert_num_queries(0):
+            list(Category.objects.all())
+
+
+@pytest.mark.django_db
+def test_save_invalidates_table(published_category):
+    assert Category.objects.cached().get().title == published_category.title
+    published_category.title = "Новое название"
+    published_category.save()
+    assert Category.objects.cached().get().title == "Новое название", (
+        "Убедитесь, что сохранение сбрасывает кэш запросов к таблице."
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_writes_invalidate_table(mixer):
+    mixer.cycle(2).blend("blog.Location", is_published=True)
+    names = Location.objects.order_by("pk").values_list("name", flat=True)
+
+    assert len(names.cached()) == 2
+    Location.objects.bulk_create([Location(name="Новое место")])
+    assert len(names.cached()) == 3
+
+    Location.objects.filter(name="Новое место").update(name="Другое")
+    assert "Другое" in names.cached()
+
+    location = Location.objects.get(name="Другое")
+    location.name = "Третье"
+    Location.objects.bulk_update([location], ["name"])
+    assert "Третье" in names.cached()
+
+    Location.objects.filter(name="Третье").delete()
+    assert len(names.cached()) == 2, (
+        "Убедитесь, что массовые операции сбрасывают кэш запросов."
+    )
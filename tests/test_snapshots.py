@@ -0,0 +1,24 @@
+import pytest
+
+from blog import snapshots
+
+
+@pytest.mark.django_db
+def test_snapshot_lookups_skip_database(
+    published_category, django_assert_num_queries
+):
+    snapshots.categories.get(published_category.pk)
+    with django_assert_num_queries(0):
+        record = snapshots.categories.get(published_category.pk)
+        assert published_category.pk in snapshots.categories.published_ids()
+    assert record.slug == published_category.slug
+
+
+@pytest.mark.django_db
+def test_snapshot_reloaded_after_change(published_category):
+    snapshots.categories.get(published_category.pk)
+    published_category.is_published = False
+    published_category.save()
+    assert (
+        published_category.pk not in snapshots.categories.published_ids()
+    ), "Убедитесь, что снимок категорий обновляется после изменения."
@@ -0,0 +1,122 @@
+import logging
+import re
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+
+from blog.page_cache import page_cache
+from blog.views import PostDetailView
+
+ENDLESS_SQL = (
+    "WITH RECURSIVE counter(x) AS "
+    "(SELECT 1 UNION ALL SELECT x + 1 FROM counter) "
+    "SELECT x FROM counter WHERE x < 0 LIMIT 1"
+)
+CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="[^"]+"')
+
+
+def normalize(content):
+    return " ".join(CSRF_RE.sub("", content).split())
+
+
+@pytest.fixture
+def long_post(mixer, user, another_user, post_with_published_location):
+    post = post_with_published_location
+    for i in range(7):
+        mixer.blend(
+            "blog.Comment",
+            post=post,
+            author=user if i % 2 else another_user,
+            text=f"Комментарий номер {i}",
+        )
+    return post
+
+
+@pytest.mark.django_db
+def test_long_post_streamed_like_regular(
+    user_client, settings, monkeypatch, long_post
+):
+    monkeypatch.setattr(PostDetailView, "stream_chunk_size", 2)
+    url = reverse("blog:post_detail", args=[long_post.id])
+    regular = user_client.get(url)
+    assert not regular.streaming
+    settings.BLOG_STREAM_COMMENTS = 3
+    page_cache.invalidate("page")
+    response = user_client.get(url)
+    assert response.streaming, (
+        "Страница публикации с длинным обсуждением должна отдаваться "
+        "потоком."
+    )
+    chunks = [chunk.decode() for chunk in response.streaming_content]
+    assert (
+        long_post.title in chunks[0] and "Комментарий" not in chunks[0]
+    ), "Первой частью ответа должны уходить шапка и текст публикации."
+    assert all(
+        chunk.count('class="media mb-4"') <= 2 for chunk in chunks
+    ), "Комментарии должны отдаваться пачками."
+    assert "Отредактировать комментарий" in "".join(
+        chunks
+    ), "В потоке должны выводиться кнопки владельца комментария."
+    assert normalize("".join(chunks)) == normalize(
+        regular.content.decode()
+    ), "Потоковая страница должна совпадать с обычной."
+
+
+@pytest.mark.django_db
+def test_short_post_not_streamed(client, long_post):
+    url = reverse("blog:post_detail", args=[long_post.id])
+    response = client.get(url)
+    assert not response.streaming and response.context["post"] == long_post
+
+
+def slow_after(monkeypatch, slow_first):
+    original = PostDetailView.get_comment_chunk
+
+    def get_comment_chunk(self, after=None):
+        if (after is None) == slow_first:
+            with connection.cursor() as cursor:
+                cursor.execute(ENDLESS_SQL)
+                cursor.fetchall()
+        return original(self, after)
+
+    monkeypatch.setattr(PostDetailView, "get_comment_chunk", get_comment_chunk)
+
+
+@pytest.mark.django_db
+def test_slow_chunk_query_interrupted(
+    client, settings, monkeypatch, caplog, long_post
+):
+    settings.BLOG_STREAM_COMMENTS = 3
+    settings.QUERY_TIME_LIMIT = 0.05
+    monkeypatch.setattr(PostDetailView, "stream_chunk_size", 2)
+    slow_after(monkeypatch, slow_first=False)
+    url = reverse("blog:post_detail", args=[long_post.id])
+    with caplog.at_level(logging.WARNING, logger="blog.timeouts"):
+        response = client.get(url)
+        content = b"".join(response.streaming_content).decode()
+    assert [r for r in caplog.records if r.name == "blog.timeouts"], (
+        "Медленный запрос пачки комментариев должен прерываться по "
+        "лимиту времени."
+    )
+    assert (
+        content.count('class="media mb-4"') == 2
+    ), "После прерванного запроса обсуждение должно обрываться."
+    assert content.rstrip().endswith(
+        "</html>"
+    ), "Страница должна закрываться и после прерванного запроса."
+
+
+@pytest.mark.django_db
+def test_slow_first_chunk_returns_503(
+    client, settings, monkeypatch, long_post
+):
+    settings.BLOG_STREAM_COMMENTS = 3
+    settings.QUERY_TIME_LIMIT = 0.05
+    slow_after(monkeypatch, slow_first=True)
+    url = reverse("blog:post_detail", args=[long_post.id])
+    response = client.get(url)
+    assert response.status_code == 503, (
+        "Если прерван запрос первой пачки комментариев, должна "
+        "возвращаться страница 503."
+    )
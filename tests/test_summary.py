@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection
+from django.template.defaultfilters import truncatewords
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_summary_updated_on_save(mixer):
+    text = "раз два три " * 200
+    post = mixer.blend("blog.Post", text=text)
+    assert post.excerpt == truncatewords(text, 10)
+    assert post.word_count == 600 and post.reading_time == 3
+
+    post.text = "коротко"
+    post.save(update_fields=["text"])
+    post = Post.objects.get(pk=post.pk)
+    assert (post.excerpt, post.word_count) == ("коротко", 1), (
+        "Убедитесь, что анонс пересчитывается при сохранении текста."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_does_not_load_text(client, mixer, published_category):
+    mixer.blend(
+        "blog.Post",
+        category=published_category,
+        text="полный текст публикации " * 50,
+    )
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/")
+    post_selects = [
+        query["sql"]
+        for query in queries.captured_queries
+        if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert post_selects and not any(
+        '"blog_post"."text"' in sql for sql in post_selects
+    ), "Убедитесь, что ленты не читают из базы полный текст публикаций."
@@ -0,0 +1,47 @@
+import logging
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.timeouts import QueryTimeout, query_budget, query_time_limit
+
+ENDLESS_SQL = (
+    "WITH RECURSIVE counter(x) AS "
+    "(SELECT 1 UNION ALL SELECT x + 1 FROM counter) "
+    "SELECT x FROM counter WHERE x < 0 LIMIT 1"
+)
+
+
+def run_endless_query(request=None):
+    with connection.cursor() as cursor:
+        cursor.execute(ENDLESS_SQL)
+        cursor.fetchall()
+    return HttpResponse("ok")
+
+
+@pytest.mark.django_db
+def test_slow_query_is_aborted_and_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="blog.timeouts"):
+        with pytest.raises(QueryTimeout) as error:
+            with query_time_limit(0.05):
+                run_endless_query()
+    assert error.value.fingerprint in caplog.text, (
+        "Убедитесь, что прерванный запрос пишется в лог с отпечатком SQL."
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        assert cursor.fetchone() == (1,)
+
+
+@pytest.mark.django_db
+def test_view_returns_degraded_response(user):
+    request = RequestFactory().get("/")
+    request.user = user
+    response = query_budget(0.05)(run_endless_query)(request)
+    assert response.status_code == 503, (
+        "Убедитесь, что при превышении лимита времени запроса"
+        " возвращается страница со статусом 503."
+    )
+    assert response["Retry-After"]
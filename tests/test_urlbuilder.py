@@ -0,0 +1,81 @@
+import pytest
+from django.urls import (
+    NoReverseMatch,
+    clear_script_prefix,
+    reverse,
+    set_script_prefix,
+)
+
+from blog.urlbuilder import blog_urls
+
+ROUTES = [
+    ("index", ()),
+    ("create_post", ()),
+    ("edit_profile", ()),
+    ("metrics", ()),
+    ("location_autocomplete", ()),
+    ("post_detail", (1,)),
+    ("post_detail", ("42",)),
+    ("edit_post", (7,)),
+    ("delete_post", (7,)),
+    ("add_comment", (7,)),
+    ("edit_comment", (7, 3)),
+    ("delete_comment", (7, 3)),
+    ("category_posts", ("travel-2023",)),
+    ("profile", ("user.name",)),
+    ("profile", ("Пользователь 1",)),
+    ("profile", ("a?b#c d",)),
+]
+
+
+@pytest.mark.parametrize("name, args", ROUTES)
+def test_matches_reverse(name, args):
+    assert blog_urls.url(name, *args) == reverse(
+        f"blog:{name}", args=args
+    ), f"Адрес `blog:{name}` должен совпадать с результатом reverse()."
+
+
+def test_kwargs():
+    assert blog_urls.url("edit_comment", post_id=7, comment_id=3) == (
+        reverse("blog:edit_comment", kwargs={"post_id": 7, "comment_id": 3})
+    ), "Адрес по именованным аргументам должен совпадать с reverse()."
+
+
+@pytest.mark.parametrize("name, args", ROUTES)
+def test_script_prefix(name, args):
+    set_script_prefix("/sub/")
+    try:
+        built = blog_urls.url(name, *args)
+        expected = reverse(f"blog:{name}", args=args)
+    finally:
+        clear_script_prefix()
+    assert built == expected and built.startswith("/sub/"), (
+        "При префиксе скрипта адрес должен совпадать с результатом "
+        "reverse()."
+    )
+
+
+@pytest.mark.parametrize(
+    "name, args",
+    [
+        ("post_detail", ("abc",)),
+        ("post_detail", ()),
+        ("category_posts", ("",)),
+        ("missing", ()),
+    ],
+)
+def test_no_reverse_match(name, args):
+    with pytest.raises(NoReverseMatch):
+        reverse(f"blog:{name}", args=args)
+    with pytest.raises(NoReverseMatch):
+        blog_urls.url(name, *args)
+
+
+@pytest.mark.django_db
+def test_template_tag(client, post_with_published_location):
+    post = post_with_published_location
+    response = client.get(reverse("blog:index"))
+    content = response.content.decode()
+    assert reverse("blog:post_detail", args=[post.id]) in content, (
+        "Карточка публикации должна ссылаться на страницу публикации."
+    )
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import visibility
+from blog.models import Post
+
+
+@pytest.fixture
+def listed_post(mixer, published_category, published_location):
+    return mixer.blend(
+        "blog.Post",
+        is_published=True,
+        category=published_category,
+        location=published_location,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+
+
+@pytest.mark.django_db
+def test_mask_follows_category_and_location(
+    listed_post, published_category, published_location
+):
+    assert listed_post.visibility == visibility.ALL
+    published_category.is_published = False
+    published_category.save()
+    published_location.is_published = False
+    published_location.save()
+    post = Post.objects.get(pk=listed_post.pk)
+    assert post.visibility == visibility.POST and not post.shows_location, (
+        "Убедитесь, что снятие категории и места с публикации обновляет "
+        "маску видимости публикаций."
+    )
+    published_location.delete()
+    published_category.is_published = True
+    published_category.save()
+    assert Post.objects.get(pk=listed_post.pk).visibility == visibility.LISTED
+
+
+@pytest.mark.django_db
+def test_index_filters_without_category_join(client, listed_post):
+    with CaptureQueriesContext(connection) as queries:
+        content = client.get("/").content.decode()
+    assert listed_post.title in content
+    assert not any(
+        'JOIN "blog_category"' in query["sql"]
+        for query in queries.captured_queries
+    ), "Убедитесь, что лента главной не соединяется с таблицей категорий."
+
+
+@pytest.mark.django_db
+def test_save_ignores_related_object_cache(listed_post, published_category):
+    post = Post.objects.get(pk=listed_post.pk)
+    post.save()
+    assert not Post.category.is_cached(post), (
+        "Убедитесь, что при сохранении публикации категория не загружается "
+        "отдельным запросом."
+    )
+    stale = Post.objects.select_related("category").get(pk=listed_post.pk)
+    published_category.is_published = False
+    published_category.save()
+    stale.save()
+    assert stale.visibility & visibility.CATEGORY == 0, (
+        "Маска видимости должна строиться по актуальной категории, а не по "
+        "копии, загруженной вместе с публикацией."
+    )
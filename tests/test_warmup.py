@@ -0,0 +1,44 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.page_cache import page_cache
+from blog.warmup import routes
+
+
+@pytest.mark.django_db
+def test_routes_cover_feeds_posts_and_pages(mixer, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        category=published_category,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    urls = routes(pages=3, posts=5)
+    assert "/" in urls and "/pages/about/" in urls and "/pages/contact/" in urls
+    assert f"/category/{published_category.slug}/" in urls
+    assert f"/posts/{post.pk}/" in urls
+    assert "/?page=2" not in urls, (
+        "Убедитесь, что прогрев не запрашивает страницы за концом ленты."
+    )
+
+
+@pytest.mark.django_db
+def test_warm_cache_fills_page_cache(mixer, published_category):
+    post = mixer.blend(
+        "blog.Post",
+        category=published_category,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    out = StringIO()
+    call_command("warm_cache", jobs=1, stdout=out)
+    assert "pages/404.html" not in out.getvalue(), (
+        "Страницы ошибок не должны попадать в отчёт прогрева: заготовки "
+        "из процесса команды воркерам не видны."
+    )
+    assert f"/posts/{post.pk}/" in out.getvalue()
+    assert page_cache.get("page", "blog:index::1") is not None, (
+        "Убедитесь, что после прогрева главная страница лежит в кэше."
+    )